@@ -0,0 +1,156 @@
+"""Offline benchmark for repeat-gg-automated.py.
+
+Starts the stand-in site, runs the real script against it (in headless Chrome) a number of
+times, and reports end-to-end and per-phase timings from the script's own trace. Results can
+be saved and compared run-over-run:
+
+    python benchmark/run_benchmark.py --runs 3 --rows 40 --save before.json
+    ... change the game or claim loop ...
+    python benchmark/run_benchmark.py --runs 3 --rows 40 --compare before.json
+
+Needs Chrome and a matching chromedriver (CHROMEDRIVER_PATH, or let Selenium find one).
+Each run starts from a fresh working directory (empty join ledger and automation profile)
+unless --keep-state is given, which measures steady-state runs instead.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from standin_site import add_site_arguments, site_from_arguments
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "repeat-gg-automated.py")
+
+
+def read_trace(path):
+    """Sum span durations per phase name from a JSON lines trace"""
+    phases = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                span = json.loads(line)
+                phase = phases.setdefault(span["name"], {"seconds": 0.0, "count": 0, "commands": 0})
+                phase["seconds"] += span["duration"]
+                phase["count"] += 1
+                phase["commands"] += span["webdriver_commands"]
+    except OSError:
+        pass
+    return phases
+
+
+def run_once(args, work_dir, run_number):
+    """Run the script once against a fresh stand-in site and return its measurements"""
+    site = site_from_arguments(args).start()
+    trace_file = os.path.join(work_dir, f"trace-{run_number}.jsonl")
+    source_profile = os.path.join(work_dir, "source_profile")
+    os.makedirs(os.path.join(source_profile, "Default"), exist_ok=True)
+    env = dict(os.environ,
+               REPEAT_GG_SITE_URL=site.url,
+               TRACE_FILE=trace_file,
+               PROFILE_PATH=source_profile,
+               PROFILE_NAME="Default")
+    if args.chromedriver:
+        env["CHROMEDRIVER_PATH"] = args.chromedriver
+
+    start = time.perf_counter()
+    with open(os.path.join(work_dir, f"output-{run_number}.txt"), "w", encoding="utf-8") as output:
+        result = subprocess.run([sys.executable, SCRIPT] + args.script_args, cwd=work_dir, env=env,
+                                stdout=output, stderr=subprocess.STDOUT, timeout=args.timeout)
+    wall = time.perf_counter() - start
+    site.shutdown()
+    site.server_close()
+
+    return {
+        "exit_code": result.returncode,
+        "wall_seconds": wall,
+        "phases": read_trace(trace_file),
+        "site": dict(site.stats),
+    }
+
+
+def summarize(runs):
+    """Median wall time and per-phase seconds across runs"""
+    summary = {"wall_seconds": statistics.median(run["wall_seconds"] for run in runs), "phases": {}}
+    names = {name for run in runs for name in run["phases"]}
+    for name in names:
+        values = [run["phases"].get(name, {}).get("seconds", 0.0) for run in runs]
+        commands = [run["phases"].get(name, {}).get("commands", 0) for run in runs]
+        summary["phases"][name] = {"seconds": statistics.median(values), "commands": statistics.median(commands)}
+    return summary
+
+
+def print_report(summary, runs, baseline=None):
+    print("\n" + "="*70)
+    print("  BENCHMARK RESULTS (median of {} run(s))".format(len(runs)))
+    print("="*70)
+    header = f"{'Phase':<24}{'Seconds':>10}{'Cmds':>8}"
+    if baseline:
+        header += f"{'Before':>10}{'Change':>10}"
+    print(header)
+
+    def row(label, seconds, commands, before):
+        line = f"{label:<24}{seconds:>10.2f}{commands:>8.0f}"
+        if baseline:
+            if before:
+                line += f"{before:>10.2f}{(seconds - before) / before * 100:>+9.0f}%"
+            else:
+                line += f"{'-':>10}{'-':>10}"
+        print(line)
+
+    before_phases = baseline["phases"] if baseline else {}
+    row("end-to-end", summary["wall_seconds"], 0, baseline["wall_seconds"] if baseline else None)
+    for name, phase in sorted(summary["phases"].items(), key=lambda item: -item[1]["seconds"]):
+        row(name, phase["seconds"], phase["commands"], before_phases.get(name, {}).get("seconds"))
+    print("="*70)
+    site = runs[-1]["site"]
+    print(f"Last run: {site['joins']} join(s), {site['claims']} claim(s), "
+          f"{site['requests']} request(s), {site['bytes'] / 1024:.0f} KB served")
+    failed = [run for run in runs if run["exit_code"] != 0]
+    if failed:
+        print(f"⚠ {len(failed)} run(s) exited with an error, see output-N.txt in the work directory")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark repeat-gg-automated.py against a local stand-in site")
+    add_site_arguments(parser)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--chromedriver", default=os.getenv("CHROMEDRIVER_PATH"))
+    parser.add_argument("--keep-state", action="store_true", help="Reuse one working directory for every run")
+    parser.add_argument("--work-dir", help="Where to keep profiles, traces and output (default: a temp dir)")
+    parser.add_argument("--timeout", type=int, default=900, help="Seconds before a run is abandoned")
+    parser.add_argument("--save", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Compare against results saved earlier with --save")
+    parser.add_argument("script_args", nargs="*", help="Extra arguments passed to the script (after --)")
+    args = parser.parse_args()
+
+    root = args.work_dir or tempfile.mkdtemp(prefix="repeat-gg-bench-")
+    print(f"Working directory: {root}")
+    runs = []
+    for run_number in range(1, args.runs + 1):
+        work_dir = root if args.keep_state else os.path.join(root, f"run-{run_number}")
+        os.makedirs(work_dir, exist_ok=True)
+        print(f"Run {run_number}/{args.runs}...", end=" ", flush=True)
+        run = run_once(args, work_dir, run_number)
+        print(f"{run['wall_seconds']:.1f}s (exit code {run['exit_code']})")
+        runs.append(run)
+
+    summary = summarize(runs)
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["summary"]
+    print_report(summary, runs, baseline)
+
+    if args.save:
+        config = {key: value for key, value in vars(args).items() if key not in ("save", "compare")}
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"config": config, "runs": runs, "summary": summary}, f, indent=2)
+        print(f"Results saved to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Local stand-in for www.repeat.gg, for benchmarking repeat-gg-automated.py offline.
+
+Serves synthetic pages that carry every selector the script depends on:
+    game pages     [data-testid="tournament row"] links with Free Entry / Join Now / Password text
+    tournament     [data-testid="tournament header"] with the h1 name and the "•" date div,
+                   the prizePool div with USD/PM spans, and a "Join Tournament" button that
+                   either opens a MuiDialog-container modal or joins silently
+    claim prizes   article.mui-2ss2o8 cards with an h3 prize and a "Claim Prize" button
+
+Pages are rendered client-side after a delay, like the React app, and every response
+can be delayed and padded. The same seed always produces the same site.
+
+Usage:
+    python benchmark/standin_site.py --rows 60 --free-ratio 0.5 --latency-ms 80 --port 8766
+"""
+import argparse
+import html
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+GAMES = ["pc/league-of-legends", "pc/rocket-league", "mobile/brawl-stars"]
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title></head>
+<body><div id="root"></div>
+<script>
+var PAGE = {data};
+var RENDER_DELAY_MS = {render_delay_ms};
+{script}
+</script>
+<!-- {padding} -->
+</body></html>
+"""
+
+LISTING_SCRIPT = """
+setTimeout(function () {
+    var root = document.getElementById('root');
+    root.innerHTML = PAGE.rows.map(function (row) {
+        return '<a data-testid="tournament row" href="/tournament/' + row.id + '">' +
+            '<h3>' + row.name + '</h3>' +
+            '<div data-notranslate="true">' + row.start + '</div>' +
+            '<span>' + (row.free ? ['Free', 'Entry'].join(' ') : '$2 Entry') + '</span>' +
+            (row.password ? '<span>Password</span>' : '') +
+            '<span data-testid="' + row.currency + '"><img alt="' + (row.currency === 'USD' ? 'dollar' : 'coins') + '">' + row.prize + '</span>' +
+            '<button>' + (row.joined ? 'Joined' : 'Join Now') + '</button>' +
+        '</a>';
+    }).join('');
+}, RENDER_DELAY_MS);
+"""
+
+DETAIL_SCRIPT = """
+setTimeout(function () {
+    var t = PAGE.tournament;
+    document.getElementById('root').innerHTML =
+        '<header data-testid="tournament header"><h1>' + t.name + '</h1>' +
+        '<div data-notranslate="true">' + t.start + ' • ' + t.end + '</div></header>' +
+        // Built from parts so the script source itself never contains the phrase the scraper checks for
+        '<p>' + (t.free ? ['Free', 'Entry'].join(' ') : '$2 Entry') + '</p>' +
+        '<div class="css-1x prizePool"><span data-testid="' + t.currency + '"><img alt="' +
+            (t.currency === 'USD' ? 'dollar' : 'coins') + '">' + t.prize + '</span></div>' +
+        '<button id="join">Join Tournament</button>';
+    document.getElementById('join').addEventListener('click', function () {
+        fetch('/api/tournaments/' + t.id + '/join', {method: 'POST'})
+            .then(function (response) { return response.json(); })
+            .then(function (result) {
+                if (result.joined) { return; }
+                var modal = document.createElement('div');
+                modal.className = 'MuiDialog-container';
+                modal.innerHTML = '<h2>' + result.reason + '</h2><p>' + result.detail + '</p>';
+                document.body.appendChild(modal);
+            });
+    });
+}, RENDER_DELAY_MS);
+"""
+
+CLAIM_SCRIPT = """
+setTimeout(function () {
+    document.getElementById('root').innerHTML = '<button>Refresh</button>' + PAGE.prizes.map(function (prize) {
+        return '<article class="mui-2ss2o8"><h3>' + prize.label + '</h3>' +
+            (prize.claimed ? '<button disabled>Already Claimed</button>'
+                           : '<button data-prize="' + prize.id + '">Claim Prize</button>') + '</article>';
+    }).join('');
+    Array.prototype.forEach.call(document.querySelectorAll('button[data-prize]'), function (button) {
+        button.addEventListener('click', function () {
+            fetch('/api/prizes/' + button.getAttribute('data-prize') + '/claim', {method: 'POST'})
+                .then(function () {
+                    button.textContent = 'Already Claimed';
+                    button.disabled = true;
+                });
+        });
+    });
+}, RENDER_DELAY_MS);
+"""
+
+
+def ordinal(day):
+    """1 -> 1st, 2 -> 2nd, 11 -> 11th, like the site's dates"""
+    suffix = "th" if 11 <= day <= 13 else {1: "st", 2: "nd", 3: "rd"}.get(day % 10, "th")
+    return f"{day}{suffix}"
+
+
+def build_site(rows, free_ratio, password_ratio, joined_ratio, modal_ratio, prizes, seed):
+    """Generate the tournaments and prizes for a stand-in site"""
+    rng = random.Random(seed)
+    tournaments = {}
+    listings = {}
+    for game in GAMES:
+        listings[game] = []
+        for n in range(rows):
+            tournament_id = f"{game.split('/')[1]}-{n}"
+            hour = rng.randint(1, 12)
+            currency = rng.choice(["USD", "PM"])
+            tournament = {
+                "id": tournament_id,
+                "name": f"{game.split('/')[1].replace('-', ' ').title()} Cup #{n}",
+                "free": rng.random() < free_ratio,
+                "password": rng.random() < password_ratio,
+                "joined": rng.random() < joined_ratio,
+                "reject": rng.random() < modal_ratio,
+                "currency": currency,
+                "prize": f"${rng.randint(1, 50)}" if currency == "USD" else str(rng.choice([500, 1000, 2500])),
+                "start": f"Oct {ordinal(rng.randint(1, 28))} • {hour}:00 PM",
+                "end": f"Oct 28th • {hour}:30 PM",
+            }
+            tournaments[tournament_id] = tournament
+            listings[game].append(tournament)
+    prize_cards = [{"id": f"prize-{n}",
+                    "label": f"{rng.choice([500, 1000, 2500])} coins" if n % 2 else f"{rng.randint(1, 20)} dollars",
+                    "claimed": n % 5 == 0} for n in range(prizes)]
+    return tournaments, listings, prize_cards
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def send_body(self, status, body, content_type):
+        site = self.server
+        if site.latency_ms:
+            time.sleep(site.latency_ms / 1000)
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(payload)
+        with site.lock:
+            site.stats["requests"] += 1
+            site.stats["bytes"] += len(payload)
+
+    def send_page(self, title, data, script):
+        site = self.server
+        self.send_body(200, PAGE_TEMPLATE.format(
+            title=html.escape(title), data=json.dumps(data), script=script,
+            render_delay_ms=site.render_delay_ms,
+            padding="x" * (site.page_kb * 1024)), "text/html; charset=utf-8")
+
+    def do_GET(self):
+        site = self.server
+        path = urlsplit(self.path).path.strip("/")
+        if path in site.listings:
+            self.send_page(path, {"rows": site.listings[path]}, LISTING_SCRIPT)
+        elif path.startswith("tournament/") and path.split("/", 1)[1] in site.tournaments:
+            self.send_page("Tournament", {"tournament": site.tournaments[path.split("/", 1)[1]]}, DETAIL_SCRIPT)
+        elif path == "marketplace/claim-prizes":
+            self.send_page("Claim Prizes", {"prizes": site.prizes}, CLAIM_SCRIPT)
+        elif path == "":
+            self.send_page("repeat.gg stand-in", {"rows": []}, LISTING_SCRIPT)
+        else:
+            self.send_body(404, "Not found", "text/plain")
+
+    def do_POST(self):
+        site = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        parts = urlsplit(self.path).path.strip("/").split("/")
+        time.sleep(site.action_latency_ms / 1000)
+        if parts[:2] == ["api", "tournaments"] and parts[2] in site.tournaments:
+            tournament = site.tournaments[parts[2]]
+            with site.lock:
+                if tournament["reject"] or tournament["joined"]:
+                    result = {"joined": False, "reason": "Unable to join",
+                              "detail": "You are already registered for this tournament."}
+                else:
+                    tournament["joined"] = True
+                    site.stats["joins"] += 1
+                    result = {"joined": True}
+            self.send_body(200, json.dumps(result), "application/json")
+        elif parts[:2] == ["api", "prizes"]:
+            with site.lock:
+                site.stats["claims"] += 1
+            self.send_body(200, json.dumps({"claimed": True}), "application/json")
+        else:
+            self.send_body(404, "{}", "application/json")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInSite(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, rows=30, free_ratio=0.5, password_ratio=0.1, joined_ratio=0.1,
+                 modal_ratio=0.2, prizes=10, latency_ms=0, render_delay_ms=300, action_latency_ms=150,
+                 page_kb=0, seed=1):
+        super().__init__(address, StandInHandler)
+        self.tournaments, self.listings, self.prizes = build_site(
+            rows, free_ratio, password_ratio, joined_ratio, modal_ratio, prizes, seed)
+        self.latency_ms = latency_ms
+        self.render_delay_ms = render_delay_ms
+        self.action_latency_ms = action_latency_ms
+        self.page_kb = page_kb
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "bytes": 0, "joins": 0, "claims": 0}
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve in a background thread; returns self"""
+        threading.Thread(target=self.serve_forever, name="standin-site", daemon=True).start()
+        return self
+
+
+def add_site_arguments(parser):
+    """Stand-in options shared with run_benchmark.py"""
+    parser.add_argument("--rows", type=int, default=30, help="Tournament rows per game page")
+    parser.add_argument("--free-ratio", type=float, default=0.5, help="Share of rows with Free Entry")
+    parser.add_argument("--password-ratio", type=float, default=0.1, help="Share of rows with a password")
+    parser.add_argument("--joined-ratio", type=float, default=0.1, help="Share of rows already joined")
+    parser.add_argument("--modal-ratio", type=float, default=0.2, help="Share of joins answered with the error modal")
+    parser.add_argument("--prizes", type=int, default=10, help="Prize cards on the claim page")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Delay before every response")
+    parser.add_argument("--render-delay-ms", type=int, default=300, help="Client-side render delay per page")
+    parser.add_argument("--action-latency-ms", type=int, default=150, help="Join/claim API response time")
+    parser.add_argument("--page-kb", type=int, default=0, help="Padding added to every page")
+    parser.add_argument("--seed", type=int, default=1)
+
+
+def site_from_arguments(args, host="127.0.0.1", port=0):
+    return StandInSite((host, port), rows=args.rows, free_ratio=args.free_ratio,
+                       password_ratio=args.password_ratio, joined_ratio=args.joined_ratio,
+                       modal_ratio=args.modal_ratio, prizes=args.prizes, latency_ms=args.latency_ms,
+                       render_delay_ms=args.render_delay_ms, action_latency_ms=args.action_latency_ms,
+                       page_kb=args.page_kb, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic repeat.gg for offline testing")
+    add_site_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    site = site_from_arguments(args, args.host, args.port)
+    print(f"Stand-in repeat.gg on {site.url} (set REPEAT_GG_SITE_URL={site.url}, Ctrl+C to stop)")
+    try:
+        site.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        site.server_close()
+
+
+if __name__ == "__main__":
+    main()
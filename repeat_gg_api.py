@@ -0,0 +1,282 @@
+"""Browser-free access to repeat.gg through the same backend calls the web app makes.
+
+Used by the HTTP fast path in repeat_gg_engine.py. The session comes from the
+automation profile, either from the cookie export written after a browser run or from
+the profile's Cookies database. Any failure raises ApiError, and the caller falls back
+to Selenium.
+"""
+import base64
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# ============================================================================
+# API CONFIGURATION - Point REPEAT_GG_API_URL at a local replay server to test
+# ============================================================================
+SITE_URL = os.getenv("REPEAT_GG_SITE_URL", "https://www.repeat.gg").rstrip("/")
+API_BASE_URL = os.getenv("REPEAT_GG_API_URL", "https://api.repeat.gg")
+TOURNAMENTS_PATH = "/tournaments"                    # GET ?platform=<pc|mobile>&game=<slug>
+TOURNAMENT_JOIN_PATH = "/tournaments/{id}/join"      # POST
+CLAIMABLE_PRIZES_PATH = "/marketplace/claim-prizes"  # GET
+PRIZE_CLAIM_PATH = "/marketplace/claim-prizes/{id}"  # POST
+REQUEST_TIMEOUT = 10  # Seconds per HTTP request
+COOKIE_DOMAIN = "repeat.gg"
+# ============================================================================
+
+
+class ApiError(Exception):
+    """A backend call failed or returned something we don't understand"""
+
+
+def first_value(data, *keys):
+    """Return the first key of data that is present and not None"""
+    for key in keys:
+        if isinstance(data, dict) and data.get(key) is not None:
+            return data[key]
+    return None
+
+
+def unwrap_list(payload, *keys):
+    """Find the list of items in a response that is either a bare list or wraps one under a key"""
+    if isinstance(payload, list):
+        return payload
+    for key in keys + ("data", "items", "results"):
+        value = first_value(payload, key)
+        if isinstance(value, list):
+            return value
+        if isinstance(value, dict):
+            nested = unwrap_list(value, *keys)
+            if nested is not None:
+                return nested
+    return None
+
+
+# ----------------------------------------------------------------------------
+# Session cookies
+# ----------------------------------------------------------------------------
+
+def read_cookie_export(path):
+    """Read cookies saved from a browser session (a JSON list of {name, value, domain} dicts)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cookies = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {c["name"]: c["value"] for c in cookies
+            if COOKIE_DOMAIN in c.get("domain", "") and c.get("value")}
+
+
+def load_cookie_key(local_state_path):
+    """Return the AES key Chrome uses for v10 cookie values on Windows, or None if unavailable.
+    Needs the optional pywin32 package to unwrap the key with DPAPI."""
+    try:
+        import win32crypt
+        with open(local_state_path, "r", encoding="utf-8") as f:
+            encrypted_key = base64.b64decode(json.load(f)["os_crypt"]["encrypted_key"])
+        return win32crypt.CryptUnprotectData(encrypted_key[5:], None, None, None, 0)[1]  # Strip "DPAPI"
+    except Exception:
+        return None
+
+
+def decrypt_cookie_value(encrypted_value, key):
+    """Decrypt a v10 (AES-GCM) Chrome cookie value. Needs the optional cryptography package."""
+    if not key or encrypted_value[:3] != b"v10":
+        return None  # Unencrypted, app-bound (v20) or no key: not something we can read
+    try:
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+        nonce, payload = encrypted_value[3:15], encrypted_value[15:]
+        return AESGCM(key).decrypt(nonce, payload, None).decode("utf-8")
+    except Exception:
+        return None
+
+
+def read_profile_cookies(user_data_dir, profile_name="Default", local_state_path=None):
+    """Read the repeat.gg cookies straight out of a Chrome profile's Cookies database.
+    The database is copied first because Chrome keeps it locked while running."""
+    profile_dir = os.path.join(user_data_dir, profile_name)
+    cookie_db = next((path for path in (os.path.join(profile_dir, "Network", "Cookies"),
+                                        os.path.join(profile_dir, "Network\\Cookies"),
+                                        os.path.join(profile_dir, "Cookies"))
+                      if os.path.isfile(path)), None)
+    if cookie_db is None:
+        return {}
+
+    key = load_cookie_key(local_state_path or os.path.join(user_data_dir, "Local State"))
+    cookies = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        snapshot = os.path.join(temp_dir, "Cookies")
+        shutil.copy2(cookie_db, snapshot)
+        connection = sqlite3.connect(snapshot)
+        try:
+            rows = connection.execute(
+                "SELECT name, value, encrypted_value FROM cookies WHERE host_key = ? OR host_key LIKE ?",
+                (COOKIE_DOMAIN, f"%.{COOKIE_DOMAIN}")).fetchall()
+        finally:
+            connection.close()
+    for name, value, encrypted_value in rows:
+        value = value or decrypt_cookie_value(encrypted_value or b"", key)
+        if value:
+            cookies[name] = value
+    return cookies
+
+
+# ----------------------------------------------------------------------------
+# Record normalisation - same shape as the rows scraped from the game pages
+# ----------------------------------------------------------------------------
+
+def normalize_prize(raw):
+    """Return (prize text, currency) where currency is "USD" or "PM" like the site's data-testids"""
+    if isinstance(raw, dict):
+        amount = first_value(raw, "amount", "value", "total")
+        currency = str(first_value(raw, "currency", "type") or "").upper()
+    else:
+        amount, currency = raw, "USD"
+    if amount is None:
+        return None, None
+    return str(amount), ("PM" if currency in ("PM", "COINS", "COIN") else "USD")
+
+
+def normalize_tournament(item):
+    """Map one tournament from the listing API onto the scraped row record shape"""
+    tournament_id = first_value(item, "id", "_id", "tournamentId")
+
+    # Only an explicit free flag or a stated zero fee counts as free; with neither the entry type
+    # is "unknown", which never qualifies for a join
+    is_free = first_value(item, "isFree", "free")
+    entry_fee = first_value(item, "entryFee", "entry_fee", "fee", "cost", "price")
+    if isinstance(entry_fee, dict):
+        entry_fee = first_value(entry_fee, "amount", "value")
+    if is_free is not None:
+        entry_type = "free" if is_free else "paid"
+    elif entry_fee is not None:
+        try:
+            entry_type = "free" if float(str(entry_fee).replace("$", "").replace(",", "")) == 0 else "paid"
+        except ValueError:
+            entry_type = "paid"
+    else:
+        entry_type = "unknown"
+
+    # An upcoming tournament isn't necessarily taking registrations yet
+    if first_value(item, "isJoined", "joined", "isRegistered", "registered"):
+        join_state = "joined"
+    elif first_value(item, "registrationOpen", "canJoin") or \
+            str(first_value(item, "status", "state") or "").lower() in ("open", "registration"):
+        join_state = "open"
+    else:
+        join_state = "closed"
+
+    prize, currency = normalize_prize(first_value(item, "prizePool", "prize_pool", "prize"))
+    path = first_value(item, "url", "path")
+    if path:
+        href = path if path.startswith("http") else SITE_URL + path
+    else:
+        href = f"{SITE_URL}/tournament/{tournament_id}"
+    return {
+        "id": tournament_id,
+        "href": href,
+        "entry_type": entry_type,
+        "join_state": join_state,
+        "password": bool(first_value(item, "hasPassword", "passwordProtected", "isPrivate")),
+        "name": first_value(item, "name", "title"),
+        "start_time": first_value(item, "startDate", "startsAt", "start_time"),
+        "end_time": first_value(item, "endDate", "endsAt", "end_time"),
+        "prize": prize,
+        "currency": currency,
+        "team_size": first_value(item, "teamSize", "team_size", "playersPerTeam"),
+    }
+
+
+def normalize_prize_card(item):
+    """Map one claimable prize onto (id, name, value, currency, claimed)"""
+    prize, currency = normalize_prize(first_value(item, "prize", "reward", "value", "amount"))
+    try:
+        value = float(str(prize).replace(",", "")) if prize is not None else 0
+    except ValueError:
+        value = 0
+    return {
+        "id": first_value(item, "id", "_id", "prizeId"),
+        "name": first_value(item, "name", "title") or f"{prize} {'coins' if currency == 'PM' else 'dollars'}",
+        "value": value,
+        "currency": "Coins" if currency == "PM" else "Dollars",
+        "claimed": bool(first_value(item, "claimed", "isClaimed")),
+    }
+
+
+# ----------------------------------------------------------------------------
+# HTTP client
+# ----------------------------------------------------------------------------
+
+class RepeatGGClient:
+    """Pooled keep-alive HTTP session authenticated with the profile's repeat.gg cookies"""
+
+    def __init__(self, cookies, base_url=None, pool_size=10):
+        if not cookies:
+            raise ApiError("No repeat.gg session cookies found")
+        self.base_url = (base_url or API_BASE_URL).rstrip("/")
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                              max_retries=Retry(total=2, backoff_factor=0.3,
+                                                status_forcelist=(502, 503, 504),
+                                                allowed_methods=("GET",)))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Accept": "application/json",
+            "Origin": SITE_URL,
+            "Referer": SITE_URL + "/",
+            # Sent as a header rather than a cookie jar so it also reaches a local replay server
+            "Cookie": "; ".join(f"{name}={value}" for name, value in cookies.items()),
+        })
+
+    def request(self, method, path, **kwargs):
+        """Make one API call and return the decoded JSON body, raising ApiError on any failure"""
+        try:
+            response = self.session.request(method, self.base_url + path, timeout=REQUEST_TIMEOUT, **kwargs)
+        except requests.RequestException as e:
+            raise ApiError(f"{method} {path} failed: {e}") from e
+        if response.status_code in (401, 403):
+            raise ApiError(f"{method} {path} was rejected ({response.status_code}), session expired?")
+        if response.status_code >= 400 and response.status_code != 409:
+            raise ApiError(f"{method} {path} returned {response.status_code}")
+        try:
+            return response.status_code, response.json() if response.content else {}
+        except ValueError as e:
+            raise ApiError(f"{method} {path} did not return JSON") from e
+
+    def list_tournaments(self, game_url):
+        """Fetch the tournament listing for a game page URL like https://www.repeat.gg/pc/rocket-league"""
+        platform, slug = game_url.rstrip("/").split("/")[-2:]
+        _, payload = self.request("GET", TOURNAMENTS_PATH, params={"platform": platform, "game": slug})
+        items = unwrap_list(payload, "tournaments")
+        if items is None:
+            raise ApiError("Tournament listing response has no list of tournaments")
+        return [normalize_tournament(item) for item in items]
+
+    def join_tournament(self, tournament_id):
+        """Join a tournament. Returns (joined, reason) where reason is the API's error message."""
+        status, payload = self.request("POST", TOURNAMENT_JOIN_PATH.format(id=tournament_id))
+        if status == 409 or (first_value(payload, "error", "message") and not first_value(payload, "success", "joined")):
+            return False, first_value(payload, "error", "message", "reason") or "Join rejected"
+        return True, None
+
+    def list_claimable_prizes(self):
+        """Fetch every prize card on the claim prizes page"""
+        _, payload = self.request("GET", CLAIMABLE_PRIZES_PATH)
+        items = unwrap_list(payload, "prizes", "rewards")
+        if items is None:
+            raise ApiError("Claimable prizes response has no list of prizes")
+        return [normalize_prize_card(item) for item in items]
+
+    def claim_prize(self, prize_id):
+        """Claim one prize. Returns True if the backend accepted it."""
+        status, payload = self.request("POST", PRIZE_CLAIM_PATH.format(id=prize_id))
+        return status != 409 and not first_value(payload, "error")
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,2720 @@
+"""repeat.gg tournament automation engine.
+
+Finds and joins free repeat.gg tournaments and claims prizes, in Chrome through Selenium (or over
+plain HTTP with the fast path). Importing this module does nothing beyond reading .env; the
+browser is only started when an Engine needs it:
+
+    from repeat_gg_engine import Engine, JoinOutcome
+
+    with Engine(LEAN_MODE=True) as engine:
+        for record in engine.join():
+            if isinstance(record, JoinOutcome) and record.outcome == "joined":
+                print(record.name)
+        for record in engine.claim():
+            print(record)
+
+repeat-gg-automated.py is the command line wrapper around it.
+"""
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+import time
+import heapq
+from datetime import datetime, timedelta
+import re
+import os
+import subprocess
+import sys
+import json
+import base64
+import shutil
+import hashlib
+import sqlite3
+import queue
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from dotenv import load_dotenv
+try:
+    import psutil
+except ImportError:
+    psutil = None
+from run_trace import tracer
+import repeat_gg_api
+from repeat_gg_api import (RepeatGGClient, ApiError, read_cookie_export, read_profile_cookies,
+                           normalize_tournament, normalize_prize_card, unwrap_list, first_value)
+
+load_dotenv()
+
+# ============================================================================
+# CONFIGURATION - Set to True for headless (invisible) or False to see browser
+# ============================================================================
+HEADLESS_MODE = True  # Change to False to see the browser while it works
+# ============================================================================
+
+# Function to close all Chrome processes and clean up lock files
+def close_chrome_processes():
+    try:
+        # Use taskkill to force close all Chrome processes
+        subprocess.run(['taskkill', '/F', '/IM', 'chrome.exe'], 
+                      stdout=subprocess.DEVNULL, 
+                      stderr=subprocess.DEVNULL)
+        print("Closed all Chrome processes")
+    except Exception as e:
+        print(f"Note: No Chrome processes to close or error closing: {e}")
+
+def remove_chrome_lock_files(profile_path, profile_name):
+    """Remove Chrome lock files to prevent profile conflicts"""
+    try:
+        import glob
+        # Lock files to remove
+        profile_dir = os.path.join(profile_path, profile_name)
+        lock_files = [
+            os.path.join(profile_path, "SingletonLock"),
+            os.path.join(profile_path, "lockfile"),
+            os.path.join(profile_dir, "SingletonLock"),
+            os.path.join(profile_dir, "lockfile")
+        ]
+        
+        for lock_file in lock_files:
+            if os.path.exists(lock_file):
+                try:
+                    os.remove(lock_file)
+                    print(f"Removed lock file: {lock_file}")
+                except:
+                    pass
+    except Exception as e:
+        print(f"Note: Could not remove lock files: {e}")
+
+# ============================================================================
+# LOGIN SESSION SYNC - Only copy what changed since the last run
+# ============================================================================
+MINIMAL_SESSION_SYNC = False         # True = only carry repeat.gg cookies and storage origins
+SESSION_ORIGIN_KEYWORD = "repeat.gg" # Host/origin fragment kept by the minimal sync
+SESSION_MANIFEST_FILE = "session_manifest.json"  # Kept inside the automation profile
+SESSION_MANIFEST_VERSION = 2         # Bumped when the manifest layout changes
+# ============================================================================
+
+# Files to copy for login session (cookies, local storage, etc.)
+SESSION_FILES = [
+    "Cookies",
+    "Network\\Cookies",
+    "Local Storage",
+    "Session Storage",
+    "IndexedDB",
+    "Preferences",
+    "Secure Preferences"
+]
+
+FICLONE = 0x40049409  # Linux ioctl that makes a copy-on-write reflink (btrfs, XFS, ...)
+
+def hash_file(path):
+    """Return the sha256 hex digest of a file, read in 1 MB chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def clone_file(source_file, dest_file):
+    """Copy a file as a copy-on-write reflink where the filesystem supports it, else a normal copy.
+    Hard links are deliberately not used: Chrome writes to these files in place, which would
+    modify the real profile too."""
+    if sys.platform.startswith("linux"):
+        try:
+            import fcntl
+            with open(source_file, "rb") as src, open(dest_file, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            shutil.copystat(source_file, dest_file)
+            return
+        except (OSError, ImportError):
+            pass  # Not a reflink-capable filesystem, fall back to a regular copy
+    shutil.copy2(source_file, dest_file)
+
+def list_session_files(source_dir):
+    """Map each session item (relative to the profile) to its full path. Single files map to
+    themselves; LevelDB stores (Local Storage, Session Storage and each IndexedDB origin) are
+    directories that are only ever copied whole. With MINIMAL_SESSION_SYNC only the repeat.gg
+    IndexedDB origins are included."""
+    session_files = {}
+    for file_name in SESSION_FILES:
+        source_path = os.path.join(source_dir, file_name)
+        if os.path.isfile(source_path):
+            session_files[file_name] = source_path
+        elif os.path.isdir(source_path) and file_name == "IndexedDB":
+            # IndexedDB keeps one store per origin, e.g. https_www.repeat.gg_0.indexeddb.leveldb
+            for name in os.listdir(source_path):
+                if MINIMAL_SESSION_SYNC and SESSION_ORIGIN_KEYWORD not in name:
+                    continue
+                session_files[os.path.join(file_name, name)] = os.path.join(source_path, name)
+        elif os.path.isdir(source_path):
+            session_files[file_name] = source_path
+    return session_files
+
+def store_snapshot(store_dir):
+    """Size and mtime of every file in a store directory, keyed by path relative to it"""
+    snapshot = {}
+    for root, dirs, files in os.walk(store_dir):
+        for name in files:
+            full_path = os.path.join(root, name)
+            stat = os.stat(full_path)
+            snapshot[os.path.relpath(full_path, store_dir)] = [stat.st_size, stat.st_mtime_ns]
+    return snapshot
+
+def copy_store(source_store, dest_store):
+    """Replace a LevelDB store directory with a fresh copy of the source (file by file so reflinks are used)"""
+    if os.path.isdir(dest_store):
+        shutil.rmtree(dest_store)
+    for root, dirs, files in os.walk(source_store):
+        dest_root = os.path.join(dest_store, os.path.relpath(root, source_store))
+        os.makedirs(dest_root, exist_ok=True)
+        for name in files:
+            clone_file(os.path.join(root, name), os.path.join(dest_root, name))
+
+def remove_session_copy(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def strip_cookies_to_origin(cookie_db):
+    """Delete every cookie row that doesn't belong to repeat.gg from a copied Cookies database"""
+    connection = sqlite3.connect(cookie_db)
+    try:
+        # repeat.gg itself and its subdomains only; a bare suffix match would keep notrepeat.gg
+        connection.execute("DELETE FROM cookies WHERE NOT (host_key = ? OR host_key LIKE ?)",
+                           (SESSION_ORIGIN_KEYWORD, f"%.{SESSION_ORIGIN_KEYWORD}"))
+        connection.commit()
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+
+def copy_login_session(source_profile_path, source_profile_name, dest_profile_path):
+    """Sync the login session from the source profile to the automation profile for auto-login.
+    A manifest of size, mtime and content hash per file means only changed files are copied;
+    when nothing changed this costs one stat per file. LevelDB stores are synced as a unit: if
+    any of their files changed in the source, or Chrome has since rewritten the copy, the whole
+    directory is replaced so source files are never mixed into a diverged database."""
+    try:
+        source_dir = os.path.join(source_profile_path, source_profile_name)
+        dest_dir = os.path.join(dest_profile_path, "Default")
+        manifest_path = os.path.join(dest_profile_path, SESSION_MANIFEST_FILE)
+
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        if manifest.get("minimal", MINIMAL_SESSION_SYNC) != MINIMAL_SESSION_SYNC or \
+                (manifest and manifest.get("version") != SESSION_MANIFEST_VERSION):
+            # Switching sync mode (or manifest layout) invalidates every previous copy
+            for rel_path in manifest.get("files", {}):
+                remove_session_copy(os.path.join(dest_dir, rel_path))
+            manifest = {}
+        entries = manifest.get("files", {})
+
+        session_files = list_session_files(source_dir)
+        copied_count = 0
+        for rel_path, source_file in session_files.items():
+            dest_file = os.path.join(dest_dir, rel_path)
+            try:
+                entry = entries.get(rel_path)
+
+                if os.path.isdir(source_file):
+                    # Unchanged source and an untouched copy: nothing to do
+                    source_snapshot = store_snapshot(source_file)
+                    if entry and os.path.isdir(dest_file) and entry.get("source") == source_snapshot and \
+                            entry.get("dest") == store_snapshot(dest_file):
+                        continue
+                    copy_store(source_file, dest_file)
+                    entries[rel_path] = {"source": source_snapshot, "dest": store_snapshot(dest_file)}
+                    copied_count += 1
+                    continue
+
+                stat = os.stat(source_file)
+                dest_exists = os.path.isfile(dest_file)
+
+                # Unchanged size and mtime: trust the previous copy without reading the file
+                if dest_exists and entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+                    continue
+
+                # Touched but identical content: just refresh the manifest entry
+                content_hash = hash_file(source_file)
+                if dest_exists and entry and entry.get("sha256") == content_hash:
+                    entries[rel_path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": content_hash}
+                    continue
+
+                # Create destination directory if needed
+                os.makedirs(os.path.dirname(dest_file), exist_ok=True)
+                clone_file(source_file, dest_file)
+                if MINIMAL_SESSION_SYNC and os.path.basename(rel_path) == "Cookies":
+                    strip_cookies_to_origin(dest_file)
+                entries[rel_path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": content_hash}
+                copied_count += 1
+            except Exception as e:
+                pass  # Skip files that can't be copied
+
+        # Remove copies of files and stores that no longer exist in the source profile. A missing
+        # source profile (wrong path, unmounted drive) lists nothing, so keep the copies then
+        removed_count = 0
+        if not os.path.isdir(source_dir):
+            print(f"Note: Source profile {source_dir} not found, keeping the existing session copy")
+        else:
+            for rel_path in [rel_path for rel_path in entries if rel_path not in session_files]:
+                remove_session_copy(os.path.join(dest_dir, rel_path))
+                del entries[rel_path]
+                removed_count += 1
+
+        with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"version": SESSION_MANIFEST_VERSION, "minimal": MINIMAL_SESSION_SYNC, "files": entries}, f)
+        os.replace(manifest_path + ".tmp", manifest_path)
+
+        if copied_count > 0 or removed_count > 0:
+            print(f"✓ Synced login session from {source_profile_name} to automation profile "
+                  f"({copied_count} changed, {removed_count} removed, {len(session_files)} total item(s))")
+        elif entries and os.path.isdir(source_dir):
+            print(f"✓ Login session from {source_profile_name} already up to date")
+        return bool(entries)
+    except Exception as e:
+        print(f"Note: Could not copy login session: {e}")
+        return False
+
+# ============================================================================
+# WAIT ENGINE - Resolve on real readiness signals instead of fixed sleeps
+# ============================================================================
+WAIT_POLL_INTERVAL = 0.1  # Seconds between readiness checks
+DOM_QUIET_MS = 400        # DOM must be mutation-free this long to count as rendered
+NETWORK_IDLE_MS = 500     # No requests in flight or started for this long counts as idle
+MODAL_SETTLE_MS = 800     # After a join click, quiet time with no modal that counts as success
+# ============================================================================
+
+# Installs (once per document) a MutationObserver plus fetch/XHR hooks, then reports
+# how long the DOM and network have been quiet. arguments[0] is an optional CSS
+# selector whose first match is returned alongside, arguments[1] re-arms the timers.
+READINESS_PROBE_JS = """
+var probe = window.__rggProbe;
+if (!probe) {
+    probe = window.__rggProbe = {lastMutation: performance.now(), lastRequest: performance.now(), pending: 0};
+    var touch = function () { probe.lastRequest = performance.now(); };
+    var settle = function () { probe.pending = Math.max(0, probe.pending - 1); touch(); };
+    new MutationObserver(function () { probe.lastMutation = performance.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            probe.pending += 1; touch();
+            return originalFetch.apply(this, arguments).finally(settle);
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        probe.pending += 1; touch();
+        this.addEventListener('loadend', settle);
+        return originalSend.apply(this, arguments);
+    };
+    try {
+        new PerformanceObserver(touch).observe({type: 'resource'});
+    } catch (e) {}
+}
+var now = performance.now();
+if (arguments[1]) { probe.lastMutation = now; probe.lastRequest = now; }
+return {
+    url: location.href,
+    readyState: document.readyState,
+    domQuietMs: now - probe.lastMutation,
+    networkQuietMs: probe.pending > 0 ? 0 : now - probe.lastRequest,
+    match: arguments[0] ? document.querySelector(arguments[0]) : null
+};
+"""
+
+def read_readiness_probe(driver, selector=None, rearm=False):
+    """Return the DOM/network quiet times for the current tab (and an optional selector match)"""
+    return driver.execute_script(READINESS_PROBE_JS, selector, rearm)
+
+def wait_until(driver, condition, timeout):
+    """Poll condition(driver) until it returns something truthy or the deadline passes.
+    Returns that value, or None on timeout."""
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=WAIT_POLL_INTERVAL).until(condition)
+    except Exception:
+        return None
+
+def wait_for_page_ready(driver, timeout=10):
+    """Wait until the current tab has left about:blank and finished parsing its document"""
+    def page_ready(d):
+        state = d.execute_script("return [location.href, document.readyState];")
+        return state[0] != "about:blank" and state[1] != "loading"
+    return bool(wait_until(driver, page_ready, timeout))
+
+def wait_for_dom_quiet(driver, timeout=5, quiet_ms=None):
+    """Wait until no DOM mutations have happened for quiet_ms (React finished rendering)"""
+    quiet_ms = quiet_ms or DOM_QUIET_MS
+    return bool(wait_until(driver, lambda d: read_readiness_probe(d)["domQuietMs"] >= quiet_ms, timeout))
+
+def wait_for_network_idle(driver, timeout=10, idle_ms=None):
+    """Wait until no fetch/XHR is in flight and none has started for idle_ms"""
+    idle_ms = idle_ms or NETWORK_IDLE_MS
+    def network_idle(d):
+        probe = read_readiness_probe(d)
+        return probe["readyState"] == "complete" and probe["networkQuietMs"] >= idle_ms
+    return bool(wait_until(driver, network_idle, timeout))
+
+def wait_for_clickable(driver, locators, timeout=10, step=None):
+    """Wait for the first of several locators to become clickable, checking all of them on
+    every poll so a dead primary locator doesn't burn its own timeout. Returns the element or None.
+    With a step name, the locator cache decides the order and learns which variants matched."""
+    if step:
+        locators = locator_cache.ordered(step, locators)
+    winner = []
+
+    def first_clickable(d):
+        for locator in locators:
+            element = EC.element_to_be_clickable(locator)(d)
+            if element:
+                winner.append(locator)
+                return element
+        return False
+
+    element = wait_until(driver, first_clickable, timeout)
+    if step:
+        # Note every variant that matches right now, not just the winner, so dead ones stand out
+        matched = [locator for locator in locators
+                   if locator in winner or (element is not None and driver.find_elements(*locator))]
+        locator_cache.record(step, locators, matched)
+    return element
+
+def click_and_wait_for_modal(driver, element, timeout=5, settle_ms=None):
+    """Click element, then wait for either the MuiDialog modal to appear or for the page to settle
+    without one. Returns the modal element, or None once it has provably not appeared."""
+    settle_ms = settle_ms or MODAL_SETTLE_MS
+    read_readiness_probe(driver, rearm=True)
+    element.click()
+
+    def modal_or_settled(d):
+        probe = read_readiness_probe(d, ".MuiDialog-container")
+        if probe["match"]:
+            return probe["match"]
+        if probe["domQuietMs"] >= settle_ms and probe["networkQuietMs"] >= settle_ms:
+            return "settled"
+        return False
+
+    outcome = wait_until(driver, modal_or_settled, timeout)
+    return None if outcome in (None, "settled") else outcome
+
+# ============================================================================
+# LOCATOR CACHE - Remember which selector variant works for each step, across runs
+# ============================================================================
+LOCATOR_CACHE_FILE = "locator_cache.json"  # Created next to the script's working directory
+LOCATOR_DEAD_AFTER = 5  # Misses in a row before a locator is reported as no longer matching
+# ============================================================================
+
+def locator_id(locator):
+    """Stable text key for a (By, value) locator or a plain CSS selector"""
+    return locator if isinstance(locator, str) else f"{locator[0]}={locator[1]}"
+
+class LocatorCache:
+    """Win/miss counts per step and locator variant, persisted as JSON. Variants that won
+    most recently are tried first next time. Shared between worker threads, so every access
+    goes through one lock."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.steps = json.load(f)
+        except (OSError, ValueError):
+            self.steps = {}
+
+    def ordered(self, step, locators):
+        """Return locators with the most recent winner first, then by total wins (ties keep the given order)"""
+        with self.lock:
+            stats = self.steps.get(step, {})
+            def rank(locator):
+                entry = stats.get(locator_id(locator), {})
+                return (-entry.get("last_win", 0), -entry.get("wins", 0))
+            return sorted(locators, key=rank)
+
+    def record(self, step, locators, matched):
+        """Count a win for every locator in matched and a miss for the rest. When nothing matched
+        (an empty claim page, a page that never rendered) nothing is counted: that says nothing
+        about which variant is stale."""
+        if not matched:
+            return
+        with self.lock:
+            stats = self.steps.setdefault(step, {})
+            for locator in locators:
+                entry = stats.setdefault(locator_id(locator), {"wins": 0, "misses": 0, "last_win": 0})
+                if locator in matched:
+                    entry["wins"] += 1
+                    entry["misses"] = 0
+                    entry["last_win"] = time.time()
+                else:
+                    entry["misses"] += 1
+
+    def dead_locators(self):
+        """(step, locator, misses in a row) for every locator that has stopped matching"""
+        with self.lock:
+            return [(step, locator, entry["misses"])
+                    for step, stats in self.steps.items() for locator, entry in stats.items()
+                    if entry["misses"] >= LOCATOR_DEAD_AFTER]
+
+    def save(self):
+        with self.lock:
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.steps, f, indent=2)
+            os.replace(temp_path, self.path)
+
+    def report(self):
+        """Print a warning for every locator that has stopped matching"""
+        for step, locator, misses in self.dead_locators():
+            print(f"⚠ Locator for {step} has not matched in {misses} attempts: {locator}")
+
+# ============================================================================
+# TOURNAMENT LIST EXTRACTION - One script call per game page
+# ============================================================================
+# Walks every tournament row in the page and returns compact records, so the Python side
+# never has to pull outerHTML (or make a round trip) per row. The substring checks run on
+# outerHTML inside the browser to keep the same semantics as the old per-row filter.
+TOURNAMENT_ROWS_JS = """
+var datePattern = /\\b[A-Za-z]+\\s\\d{1,2}(?:st|nd|rd|th)?\\s•\\s\\d{1,2}:\\d{2}\\s[APM]{2}\\b/;
+var rows = document.querySelectorAll('[data-testid="tournament row"]');
+return Array.prototype.map.call(rows, function (row) {
+    var html = row.outerHTML;
+    var text = row.innerText || '';
+    var link = row.href ? row : (row.closest('a[href]') || row.querySelector('a[href]'));
+    var heading = row.querySelector('h1, h2, h3, h4, h5, h6');
+    var prize = row.querySelector('[data-testid="USD"], [data-testid="PM"]');
+    var date = text.match(datePattern);
+    var teamSize = text.match(/\\b(\\d+)\\s?v\\s?\\d+\\b/i);
+    var joinState = 'closed';
+    if (html.indexOf('Join Now') !== -1) {
+        joinState = 'open';
+    } else if (/Joined|Registered/.test(text)) {
+        joinState = 'joined';
+    }
+    return {
+        href: link ? link.href : null,
+        entry_type: html.indexOf('Free Entry') !== -1 ? 'free' : 'paid',
+        join_state: joinState,
+        password: html.indexOf('Password') !== -1,
+        name: heading ? heading.innerText.trim() : (text.split('\\n')[0] || '').trim(),
+        start_time: date ? date[0] : null,
+        prize: prize ? prize.innerText.trim() : null,
+        currency: prize ? prize.getAttribute('data-testid') : null,
+        team_size: teamSize ? parseInt(teamSize[1], 10) : null
+    };
+});
+"""
+
+def extract_tournament_rows(driver):
+    """Return one record per tournament row on the current game page:
+    href, entry_type, join_state, password, name, start_time, prize, currency and team_size"""
+    return driver.execute_script(TOURNAMENT_ROWS_JS) or []
+
+def row_qualifies(row):
+    """Check for "Free Entry" and "Join Now" but exclude "Password" (and rows without a link)"""
+    return bool(row["href"]) and row["entry_type"] == "free" and row["join_state"] == "open" and not row["password"]
+
+# Reads everything process_tournament_tab needs from a tournament page in one call. The dates come
+# from the "•" div in the header (falling back to anywhere on the page, like the old XPath did),
+# and join_state is "open", "disabled", "joined" or "missing" for the Join Tournament button.
+# The free check searches the markup like the old page_source check and TOURNAMENT_ROWS_JS do
+# (innerText would follow text-transform and skip hidden text).
+TOURNAMENT_DETAIL_JS = """
+var datePattern = /\\b[A-Za-z]+\\s\\d{1,2}(?:st|nd|rd|th)?\\s•\\s\\d{1,2}:\\d{2}\\s[APM]{2}\\b/g;
+var header = document.querySelector('[data-testid="tournament header"]');
+var findDuration = function (scope) {
+    return scope ? Array.prototype.find.call(scope.querySelectorAll('div[data-notranslate="true"]'), function (div) {
+        return div.textContent.indexOf('•') !== -1;
+    }) : null;
+};
+var duration = findDuration(header) || findDuration(document);
+var dates = duration ? (duration.innerHTML.match(datePattern) || []) : [];
+var heading = header ? header.querySelector('h1') : null;
+
+var prize = null;
+var pool = document.querySelector('div[class*="prizePool"]');
+if (pool) {
+    var usd = pool.querySelector('span[data-testid="USD"]');
+    var coins = pool.querySelector('span[data-testid="PM"]');
+    if (usd && usd.querySelector('img[alt="dollar"]')) {
+        prize = {amount: usd.innerText.trim(), currency: 'USD'};
+    } else if (coins && coins.querySelector('img[alt="coins"]')) {
+        prize = {amount: coins.innerText.trim(), currency: 'PM'};
+    }
+}
+
+var buttons = Array.prototype.slice.call(document.querySelectorAll('button'));
+var joinButton = buttons.find(function (button) { return button.textContent.indexOf('Join Tournament') !== -1; });
+var joinState = 'missing';
+if (joinButton) {
+    joinState = joinButton.disabled ? 'disabled' : 'open';
+} else if (buttons.some(function (button) { return /Joined|Registered|Leave Tournament/.test(button.textContent); })) {
+    joinState = 'joined';
+}
+
+return {
+    url: location.href,
+    free: document.documentElement.outerHTML.indexOf('Free Entry') !== -1,
+    name: heading ? heading.innerHTML : null,
+    dates: dates,
+    start_time: dates[0] || null,
+    end_time: dates[1] || null,
+    prize: prize ? prize.amount : null,
+    currency: prize ? prize.currency : null,
+    join_state: joinState
+};
+"""
+
+def extract_tournament_detail(driver):
+    """Return the tournament open in the current tab as one record:
+    url, free, name, dates, start_time, end_time, prize, currency and join_state"""
+    return driver.execute_script(TOURNAMENT_DETAIL_JS)
+
+# ============================================================================
+# JOIN LEDGER - Remember tournaments already handled so they are never reopened
+# ============================================================================
+LEDGER_FILE = os.getenv("JOIN_LEDGER_FILE", "join_ledger.sqlite3")  # Relative to the working directory
+LEDGER_DEFAULT_TTL_DAYS = 7          # Expiry for entries whose end date couldn't be parsed
+SKIP_UNCHANGED_LISTINGS = True       # Skip a game's tournament pages when its listing hasn't changed
+LISTING_RECHECK_HOURS = 6            # Open the tournament pages again after this long regardless
+# ============================================================================
+
+DATE_PATTERN = r'\b[A-Za-z]+\s\d{1,2}(?:st|nd|rd|th)?\s•\s\d{1,2}:\d{2}\s[APM]{2}\b'
+
+def parse_tournament_date(date_text, now=None):
+    """Turn a repeat.gg date like "Oct 18th • 7:00 PM" (or an ISO timestamp) into a local datetime.
+    The site omits the year, so pick the one that puts the date closest to now."""
+    if not date_text:
+        return None
+    now = now or datetime.now()
+    try:
+        # The HTTP fast path gets ISO timestamps straight from the API
+        parsed = datetime.fromisoformat(str(date_text).replace("Z", "+00:00"))
+        return parsed.astimezone().replace(tzinfo=None) if parsed.tzinfo else parsed
+    except ValueError:
+        pass
+    cleaned = re.sub(r'(\d)(?:st|nd|rd|th)', r'\1', date_text).replace("•", "")
+    cleaned = " ".join(cleaned.split())
+    for date_format in ("%b %d %I:%M %p", "%B %d %I:%M %p"):
+        try:
+            parsed = datetime.strptime(f"{now.year} {cleaned}", f"%Y {date_format}")
+        except ValueError:
+            continue
+        candidates = [parsed.replace(year=now.year + offset) for offset in (-1, 0, 1)]
+        return min(candidates, key=lambda candidate: abs(candidate - now))
+    return None
+
+def tournament_key(url):
+    """Key a tournament by its URL without query string, fragment or trailing slash"""
+    return url.split("#")[0].split("?")[0].rstrip("/")
+
+def listing_fingerprint(rows, now=None, rules=None):
+    """Fingerprint the free, public tournaments of a game listing (URL plus join state), and find
+    the next registration boundary: the soonest upcoming registration opening or start time.
+    Returns (fingerprint, boundary timestamp or None)."""
+    now = now or datetime.now()
+    public = sorted((tournament_key(row["href"]), row["join_state"]) for row in rows
+                    if row["href"] and row["entry_type"] == "free" and not row["password"])
+    fingerprint = hashlib.sha256(json.dumps([public, rules]).encode("utf-8")).hexdigest()
+    boundaries = []
+    for row in rows:
+        starts_at = parse_tournament_date(row.get("start_time"), now)
+        if starts_at:
+            boundaries += [starts_at - timedelta(minutes=REGISTRATION_LEAD_MINUTES), starts_at]
+    upcoming = [boundary for boundary in boundaries if boundary > now]
+    return fingerprint, (min(upcoming).timestamp() if upcoming else None)
+
+class JoinLedger:
+    """SQLite record of every tournament we've joined or been turned away from, keyed by URL.
+    Shared between worker threads, so every access goes through one lock."""
+
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS joins (
+                tournament TEXT PRIMARY KEY,
+                outcome TEXT NOT NULL,
+                reason TEXT,
+                name TEXT,
+                prize TEXT,
+                currency TEXT,
+                starts_at REAL,
+                ends_at REAL,
+                expires_at REAL NOT NULL,
+                recorded_at REAL NOT NULL
+            )
+        """)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS listings (
+                game TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                next_boundary REAL,
+                recorded_at REAL NOT NULL
+            )
+        """)
+        self.connection.commit()
+
+    def prune(self):
+        """Drop entries whose tournament has ended. Returns how many were removed."""
+        with self.lock:
+            cursor = self.connection.execute("DELETE FROM joins WHERE expires_at < ?", (time.time(),))
+            self.connection.commit()
+            return cursor.rowcount
+
+    def filter_new(self, links):
+        """Return only the links that have no ledger entry yet, keeping their order"""
+        with self.lock:
+            known = {row[0] for row in self.connection.execute("SELECT tournament FROM joins")}
+        return [link for link in links if tournament_key(link) not in known]
+
+    def record(self, url, outcome, reason=None, name=None, prize=None, currency=None, dates=None):
+        """Store the outcome of a join attempt ("joined", "rejected" or "not_free").
+        dates are the raw date strings from the tournament header (start, then end)."""
+        starts_at = parse_tournament_date(dates[0]) if dates else None
+        ends_at = parse_tournament_date(dates[-1]) if dates else None
+        if ends_at:
+            expires_at = ends_at.timestamp()
+        else:
+            expires_at = time.time() + LEDGER_DEFAULT_TTL_DAYS * 86400
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO joins VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (tournament_key(url), outcome, reason, name, prize, currency,
+                 starts_at.timestamp() if starts_at else None, ends_at.timestamp() if ends_at else None,
+                 expires_at, time.time()))
+            self.connection.commit()
+
+    def listing_unchanged(self, game_url, fingerprint):
+        """True if game_url's listing had this fingerprint when its tournaments were last handled,
+        and no registration boundary (or the recheck interval) has passed since"""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT fingerprint, next_boundary, recorded_at FROM listings WHERE game = ?", (game_url,)).fetchone()
+        if row is None or row[0] != fingerprint:
+            return False
+        now = time.time()
+        if row[1] is not None and now >= row[1]:
+            return False
+        return now - row[2] < LISTING_RECHECK_HOURS * 3600
+
+    def record_listing(self, game_url, fingerprint, next_boundary):
+        """Remember the listing whose tournaments have just been handled"""
+        with self.lock:
+            self.connection.execute("INSERT OR REPLACE INTO listings VALUES (?, ?, ?, ?)",
+                                    (game_url, fingerprint, next_boundary, time.time()))
+            self.connection.commit()
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+# ============================================================================
+# HTTP FAST PATH - Join and claim through the backend API, no browser needed
+# ============================================================================
+HTTP_FAST_PATH = False  # True = try plain HTTP first and only start Chrome for what fails
+SESSION_COOKIE_EXPORT = "session_cookies.json"  # Written into the automation profile after browser runs
+# ============================================================================
+
+def export_session_cookies(driver, path):
+    """Save the browser's repeat.gg cookies so the next run's HTTP fast path can reuse the session"""
+    try:
+        cookies = [c for c in driver.get_cookies() if "repeat.gg" in c.get("domain", "")]
+        if cookies:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(cookies, f)
+    except Exception as e:
+        print(f"Note: Could not export session cookies: {e}")
+
+def run_http_fast_path(games, automation_profile):
+    """Find, join and claim over plain HTTP using the automation profile's session cookies.
+    Returns ({game_index: successful_joins}, games that still need the browser, whether prizes were claimed)."""
+    print("\n" + "="*70)
+    print("  Trying the HTTP fast path...")
+    print("="*70)
+    prepare_automation_profile()
+    try:
+        cookies = read_cookie_export(os.path.join(automation_profile, SESSION_COOKIE_EXPORT)) or \
+            read_profile_cookies(automation_profile, "Default", os.path.join(PROFILE_PATH or "", "Local State"))
+        client = RepeatGGClient(cookies)
+    except Exception as e:
+        print(f"⚠ HTTP fast path unavailable ({e}), using the browser instead")
+        return {}, games, False
+
+    game_results = {}
+    browser_games = []
+    try:
+        for game_index, game in enumerate(games, 1):
+            try:
+                tournament_rows = client.list_tournaments(game['url'])
+                latest_listings[game['url']] = tournament_rows
+                print(f"\n{game['name']}: found {len(tournament_rows)} tournament(s)")
+                qualifying = apply_game_filter(game, [row for row in tournament_rows if row_qualifies(row)])
+                new_links = set(join_ledger.filter_new([row["href"] for row in qualifying]))
+                game_successful_joins = 0
+                for row in qualifying:
+                    if row["href"] not in new_links:
+                        continue
+                    joined, reason = client.join_tournament(row["id"])
+                    dates = [date for date in (row["start_time"], row["end_time"]) if date]
+                    if joined:
+                        game_successful_joins += 1
+                        print(f"✓ Joined {row['name']}")
+                        record_outcome(game, row["href"], "joined", name=row["name"], prize=row["prize"],
+                                       currency=row["currency"], dates=dates)
+                    else:
+                        print(f"Join Unsuccessful: {row['name']} - Reason: {reason}")
+                        record_outcome(game, row["href"], "rejected", reason=reason, name=row["name"],
+                                       prize=row["prize"], currency=row["currency"], dates=dates)
+                game_results[game_index] = game_successful_joins
+                print(f"{game['name']} Summary: {game_successful_joins} tournament(s) successfully joined")
+            except ApiError as e:
+                print(f"⚠ HTTP fast path failed for {game['name']} ({e}), falling back to the browser")
+                browser_games.append(game)
+
+        try:
+            prizes = client.list_claimable_prizes()
+            total_claimed_value = 0
+            claimed_count = 0
+            for prize in prizes:
+                if prize["claimed"]:
+                    status = "already_claimed"
+                elif client.claim_prize(prize["id"]):
+                    print(f"✓ Claimed {prize['name']}")
+                    total_claimed_value += prize["value"]
+                    claimed_count += 1
+                    status = "claimed"
+                else:
+                    status = "unavailable"
+                emit(PrizeRecord(name=prize["name"], value=prize["value"], currency=prize["currency"],
+                                 status=status, confirmed=True if status == "claimed" else None))
+            print_claim_summary(len(prizes), claimed_count, total_claimed_value)
+            claims_done = True
+        except ApiError as e:
+            print(f"⚠ HTTP prize claiming failed ({e}), falling back to the browser")
+            claims_done = False
+    finally:
+        client.close()
+    return game_results, browser_games, claims_done
+
+# ============================================================================
+# DAEMON MODE - Stay running and wake only when there is something to do
+# ============================================================================
+DAEMON_MODE = False             # True (or run with --daemon) to keep running instead of exiting
+DAEMON_REFRESH_MINUTES = 30     # Re-check the listings at least this often
+DAEMON_MIN_SLEEP_MINUTES = 2    # Never wake up more often than this
+REGISTRATION_LEAD_MINUTES = 60  # Registration is assumed to open this long before the start time
+# ============================================================================
+
+# Latest tournament rows seen per game URL, used by the daemon to schedule its next wake-up
+latest_listings = {}
+
+# ============================================================================
+# LEAN MODE - Skip everything the scraper never reads (images, fonts, video, trackers)
+# ============================================================================
+LEAN_MODE = False  # True = block heavy resources and third-party scripts, return from loads early
+LEAN_BLOCKED_URL_PATTERNS = [
+    # Images, web fonts and video by file type
+    "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.ico*",
+    "*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*",
+    "*.mp4*", "*.webm*", "*.m3u8*",
+    # Analytics, ads and session recording
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*facebook.net*", "*connect.facebook.*", "*hotjar.com*", "*segment.io*", "*segment.com*",
+    "*intercom.io*", "*intercomcdn.com*", "*sentry.io*", "*clarity.ms*", "*tiktok.com*", "*twitter.com/i/*",
+]
+# ============================================================================
+
+# Sums the bytes the current tab has transferred (document plus every subresource)
+PAGE_WEIGHT_JS = """
+var entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+var bytes = 0;
+entries.forEach(function (entry) { bytes += entry.transferSize || 0; });
+return [bytes, entries.length];
+"""
+
+def apply_lean_blocking(driver):
+    """Block LEAN_BLOCKED_URL_PATTERNS in the current tab through the DevTools protocol.
+    Blocking is per tab, so this has to run in every tab before it navigates."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"Note: Could not enable request blocking: {e}")
+
+def page_transfer_stats(driver):
+    """Return (bytes transferred, request count) for the current tab"""
+    try:
+        transferred, requests_made = driver.execute_script(PAGE_WEIGHT_JS)
+        return transferred, requests_made
+    except Exception:
+        return 0, 0
+
+# ============================================================================
+# TAB PIPELINE - A bounded window of tournament tabs, handled in the order they become ready
+# ============================================================================
+TAB_WINDOW = 4          # Tournament tabs loading at once per game (caps renderer memory)
+TAB_READY_TIMEOUT = 15  # Seconds before a tab that never renders is handled anyway
+# ============================================================================
+
+TOURNAMENT_HEADER_SELECTOR = '[data-testid="tournament header"]'
+
+def open_pipeline_tab(driver):
+    """Open a blank tab and return its handle (the driver is left switched to it)"""
+    known_handles = set(driver.window_handles)
+    driver.execute_script("window.open('about:blank', '_blank');")
+    handle = next(h for h in driver.window_handles if h not in known_handles)
+    driver.switch_to.window(handle)
+    if LEAN_MODE:
+        apply_lean_blocking(driver)  # Blocking stays in place for every page this tab navigates to
+    return handle
+
+def tab_is_ready(probe, previous_url, quiet_ms=None):
+    """True once a tab has left its previous page and rendered a quiet tournament header"""
+    quiet_ms = quiet_ms or DOM_QUIET_MS
+    return (probe["url"] not in (previous_url, "about:blank") and probe["readyState"] != "loading"
+            and probe["match"] is not None and probe["domQuietMs"] >= quiet_ms)
+
+# ============================================================================
+# RUN BUDGET - Join the most valuable, soonest-closing tournaments first, within a time limit
+# ============================================================================
+RUN_BUDGET_MINUTES = 50       # Whole run must finish within this (0 = no budget, games in list order)
+CLAIM_RESERVE_SECONDS = 60    # Kept free at the end of the budget for claiming prizes
+URGENT_WINDOW_MINUTES = 60    # Tournaments starting within this are joined before everything else
+COINS_PER_USD = 1000          # PM coins worth one dollar, to compare coin and cash prize pools
+# ============================================================================
+
+# ============================================================================
+# API CAPTURE - Read the JSON the pages already fetch instead of scraping what they render
+# ============================================================================
+API_CAPTURE = False      # True = build records from the site's own API responses (DOM is the fallback)
+API_CAPTURE_TIMEOUT = 8  # Seconds to wait for a page's data response before falling back to the DOM
+# Which responses are which. The paths are what the web app is expected to call; adjust them
+# here if the site's API moves.
+API_CAPTURE_PATTERNS = {
+    "tournament_list": re.compile(r"/tournaments/?(\?|$)"),
+    "tournament_detail": re.compile(r"/tournaments?/([^/?]+)/?(\?|$)"),
+    "prizes": re.compile(r"/(claim-prizes|prizes|rewards)/?(\?|$)"),
+}
+# ============================================================================
+
+class ResponseCapture:
+    """JSON responses of the site's API calls, read from one driver's performance log.
+    Bodies can only be fetched once a response has finished loading, so requests are kept
+    pending until then."""
+
+    def __init__(self):
+        self.pending = {}   # requestId -> (kind, url, seen at)
+        self.finished = set()
+        self.payloads = []  # (kind, url, decoded JSON)
+
+    def poll(self, driver):
+        """Read new performance log entries and fetch the bodies of finished API responses"""
+        try:
+            entries = driver.get_log("performance")
+        except Exception:
+            return
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            params = message.get("params", {})
+            if message["method"] == "Network.responseReceived":
+                response = params["response"]
+                if "json" not in response.get("mimeType", ""):
+                    continue
+                kind = next((kind for kind, pattern in API_CAPTURE_PATTERNS.items()
+                             if pattern.search(response["url"].split("#")[0])), None)
+                if kind:
+                    self.pending[params["requestId"]] = (kind, response["url"], time.monotonic())
+            elif message["method"] == "Network.loadingFinished":
+                self.finished.add(params["requestId"])
+
+        for request_id in list(self.pending):
+            kind, url, seen_at = self.pending[request_id]
+            if request_id in self.finished:
+                try:
+                    # Only works while the tab that made the request is the current one
+                    body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                    text = base64.b64decode(body["body"]) if body.get("base64Encoded") else body["body"]
+                    self.payloads.append((kind, url, json.loads(text)))
+                    del self.pending[request_id]
+                    self.finished.discard(request_id)
+                    continue
+                except Exception:
+                    pass
+            if time.monotonic() - seen_at > 30:
+                del self.pending[request_id]
+                self.finished.discard(request_id)
+
+    def mark(self):
+        """Position to pass to latest() to ignore everything captured so far"""
+        return len(self.payloads)
+
+    def latest(self, kind, since=0, url_contains=None):
+        """The most recent payload of kind captured after since, or None"""
+        for captured_kind, url, payload in reversed(self.payloads[since:]):
+            if captured_kind == kind and (url_contains is None or url_contains in url):
+                return payload
+        return None
+
+# One capture per browser session
+response_captures = {}
+
+def capture_for(driver):
+    return response_captures.setdefault(driver.session_id, ResponseCapture())
+
+def wait_for_api_payload(driver, kind, since, timeout=None, url_contains=None):
+    """Wait for the current page's kind response to land. Returns its JSON, or None on timeout."""
+    timeout = timeout or API_CAPTURE_TIMEOUT
+    capture = capture_for(driver)
+    def payload_captured(d):
+        capture.poll(d)
+        payload = capture.latest(kind, since, url_contains)
+        return {"payload": payload} if payload is not None else False
+    result = wait_until(driver, payload_captured, timeout)
+    return result["payload"] if result else None
+
+def captured_rows_usable(rows):
+    """normalize_tournament guesses the API's field names, so only trust captured rows when every
+    one has a real link and a stated entry fee, and some row has a join state the payload actually
+    stated ("closed" is also what it falls back to)"""
+    return bool(rows) and all(row["href"] and not row["href"].endswith("/None") and
+                              row["entry_type"] != "unknown" for row in rows) and \
+        any(row["join_state"] in ("open", "joined") for row in rows)
+
+def apply_captured_detail(driver, detail):
+    """Overwrite the DOM-read detail fields with the tournament page's own API data, if it was captured"""
+    tournament_id = tournament_key(detail["url"]).rsplit("/", 1)[-1]
+    payload = wait_for_api_payload(driver, "tournament_detail", 0, timeout=1, url_contains=tournament_id)
+    if not isinstance(payload, dict):
+        return detail
+    item = first_value(payload, "tournament", "data")
+    record = normalize_tournament(item if isinstance(item, dict) else payload)
+    dates = [date for date in (record["start_time"], record["end_time"]) if date]
+    return dict(detail,
+                # Unless the payload states the fee, the page's Free Entry check decides
+                free=record["entry_type"] == "free" if record["entry_type"] != "unknown" else detail["free"],
+                name=record["name"] or detail["name"],
+                dates=dates or detail["dates"],
+                start_time=record["start_time"] or detail["start_time"],
+                end_time=record["end_time"] or detail["end_time"],
+                prize=record["prize"] if record["prize"] is not None else detail["prize"],
+                currency=record["currency"] if record["prize"] is not None else detail["currency"])
+
+def enable_api_capture(options):
+    """Turn on the performance log the capture reads (network events only)"""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+# ============================================================================
+# TRACING - Per-phase timings, WebDriver command counts and Chrome memory
+# ============================================================================
+TRACE_FILE = os.getenv("TRACE_FILE")  # e.g. trace.json (chrome://tracing format) or trace.jsonl
+# ============================================================================
+
+# ============================================================================
+# MULTI-ACCOUNT - Set by run_accounts.py when several accounts run side by side
+# ============================================================================
+RUN_SUMMARY_FILE = os.getenv("RUN_SUMMARY_FILE")        # JSON summary of each pass is written here
+SHARED_LISTINGS_DIR = os.getenv("SHARED_LISTINGS_DIR")  # Game listings are shared through this folder
+SHARED_LISTING_MAX_AGE = 300  # Seconds a shared game listing stays fresh
+SHARED_LISTING_WAIT = 60      # Seconds to wait for another account that is loading the same game page
+# ============================================================================
+
+# Results of the current pass, written to RUN_SUMMARY_FILE
+run_summary = {}
+
+def shared_listing_path(game_url):
+    return os.path.join(SHARED_LISTINGS_DIR, hashlib.sha256(game_url.encode("utf-8")).hexdigest()[:16] + ".json")
+
+def read_shared_listing(game_url):
+    """Return the tournament rows another account saved for game_url, or None if missing or stale.
+    Join state is per account, so rows someone else already joined come back as open."""
+    try:
+        with open(shared_listing_path(game_url), "r", encoding="utf-8") as f:
+            listing = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - listing["saved_at"] > SHARED_LISTING_MAX_AGE:
+        return None
+    return [dict(row, join_state="open") if row["join_state"] == "joined" else row for row in listing["rows"]]
+
+def fetch_shared_listing(game_url):
+    """Return a fresh shared listing for game_url, waiting for another account that is loading it.
+    Returns None when this account should load the page itself (and then publish_shared_listing)."""
+    if not SHARED_LISTINGS_DIR:
+        return None
+    os.makedirs(SHARED_LISTINGS_DIR, exist_ok=True)
+    lock_path = shared_listing_path(game_url) + ".lock"
+    deadline = time.monotonic() + SHARED_LISTING_WAIT
+    while True:
+        rows = read_shared_listing(game_url)
+        if rows is not None:
+            return rows
+        try:
+            if os.path.exists(lock_path) and time.time() - os.path.getmtime(lock_path) > SHARED_LISTING_WAIT:
+                os.remove(lock_path)  # Left behind by an account that crashed mid-load
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return None  # Our turn to load it
+        except FileExistsError:
+            pass
+        except OSError:
+            return None
+        if time.monotonic() > deadline:
+            return None
+        time.sleep(0.5)
+
+def publish_shared_listing(game_url, rows):
+    """Save this account's rows for game_url and release the loading lock"""
+    if not SHARED_LISTINGS_DIR:
+        return
+    path = shared_listing_path(game_url)
+    try:
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"game": game_url, "saved_at": time.time(), "rows": rows}, f)
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(f"Note: Could not share the {game_url} listing: {e}")
+    release_shared_listing(game_url)
+
+def release_shared_listing(game_url):
+    """Release the loading lock taken by fetch_shared_listing (a no-op once published)"""
+    if not SHARED_LISTINGS_DIR:
+        return
+    try:
+        os.remove(shared_listing_path(game_url) + ".lock")
+    except OSError:
+        pass
+
+def write_run_summary(path):
+    """Write the current pass's results as JSON (for run_accounts.py)"""
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(run_summary, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+def print_claim_summary(processed, claimed, value):
+    """Print the CLAIMING SUMMARY and keep the totals for the run summary"""
+    run_summary["claims"] = {"processed": processed, "claimed": claimed, "value": value}
+    print(f"\n" + "="*70)
+    print("  CLAIMING SUMMARY")
+    print("="*70)
+    print(f"Total prizes processed: {processed}")
+    print(f"Successfully claimed: {claimed}")
+    print(f"Total value claimed: ${value:.2f}")
+    print("="*70)
+
+# ============================================================================
+# CLAIM ENGINE - Read, click and confirm every prize card in a few script calls
+# ============================================================================
+CLAIM_CONFIRM_TIMEOUT = 10  # Seconds to wait for clicked cards to show as claimed
+# ============================================================================
+
+# Selector variants for a prize card, ordered by the locator cache at run time. The class name
+# is generated by the site's CSS-in-JS build, so it can change with any deploy.
+PRIZE_CARD_SELECTORS = ["article.mui-2ss2o8", "article:has(h3)"]
+
+# One record per prize card: its h3 text, whether it's already claimed, and whether it has an
+# enabled "Claim Prize" button. arguments[0] are the card selectors to try; the first one that
+# matches anything is used, and every one that matched is reported.
+PRIZE_CARDS_JS = """
+var matched = arguments[0].filter(function (selector) { return document.querySelector(selector) !== null; });
+var selector = matched[0] || null;
+var cards = selector ? document.querySelectorAll(selector) : [];
+return {selector: selector, matched: matched, cards: Array.prototype.map.call(cards, function (card, index) {
+    var heading = card.querySelector('h3');
+    var claimButton = Array.prototype.find.call(card.querySelectorAll('button'), function (button) {
+        return button.textContent.replace(/\\s+/g, ' ').indexOf('Claim Prize') !== -1 && !button.disabled;
+    });
+    var claimed = (card.innerText || '').indexOf('Already Claimed') !== -1;
+    return {
+        index: index,
+        text: heading ? heading.innerText.trim() : '',
+        claimed: claimed,
+        claimable: !claimed && !!claimButton
+    };
+})};
+"""
+
+# Clicks the "Claim Prize" button of every card index in arguments[0] (cards found with the
+# selector in arguments[1]) and remembers them so the confirmation check can watch them.
+# Returns the indexes that were actually clicked.
+CLAIM_PRIZES_JS = """
+var cards = document.querySelectorAll(arguments[1]);
+window.__rggClaims = [];
+arguments[0].forEach(function (index) {
+    var card = cards[index];
+    var button = card && Array.prototype.find.call(card.querySelectorAll('button'), function (button) {
+        return button.textContent.replace(/\\s+/g, ' ').indexOf('Claim Prize') !== -1 && !button.disabled;
+    });
+    if (button) {
+        button.click();
+        window.__rggClaims.push({index: index, card: card, button: button});
+    }
+});
+return window.__rggClaims.map(function (claim) { return claim.index; });
+"""
+
+# A clicked card counts as confirmed once its button is gone or disabled, the card says
+# "Already Claimed", or the card has been removed from the page. pending_indexes are the
+# card indexes still waiting.
+CLAIM_CONFIRMATION_JS = """
+var confirmed = 0, pendingIndexes = [];
+(window.__rggClaims || []).forEach(function (claim) {
+    if (!claim.card.isConnected || !claim.button.isConnected || claim.button.disabled ||
+            (claim.card.innerText || '').indexOf('Already Claimed') !== -1) {
+        confirmed += 1;
+    } else {
+        pendingIndexes.push(claim.index);
+    }
+});
+return {confirmed: confirmed, pending: pendingIndexes.length, pending_indexes: pendingIndexes};
+"""
+
+def claims_confirmed(driver):
+    """wait_until condition: the confirmation state once no clicked card is still pending"""
+    state = driver.execute_script(CLAIM_CONFIRMATION_JS)
+    return state if state and state["pending"] == 0 else False
+
+def parse_prize_text(prize_text):
+    """Extract (numeric value, currency type) from a prize heading like "2500 coins" or "100 dollars".
+    Currency type is "Coins", "Dollars" or "" when it can't be determined."""
+    # Look for patterns like "2500 coins" or "100 dollars"
+    if "coins" in prize_text.lower():
+        currency_type = "Coins"
+    elif "dollars" in prize_text.lower() or "$" in prize_text:
+        currency_type = "Dollars"
+    else:
+        return 0, ""
+    numeric_match = re.search(r'(\d+(?:,\d{3})*(?:\.\d+)?)', prize_text)
+    # Remove commas and convert to float
+    prize_value = float(numeric_match.group(1).replace(',', '')) if numeric_match else 0
+    return prize_value, currency_type
+
+# ============================================================================
+# WORKER POOL - Run several games at once, each on its own isolated Chrome
+# ============================================================================
+PARALLEL_WORKERS = 1    # Number of games processed at the same time (1 = one after another)
+BASE_DEBUG_PORT = int(os.getenv("DEBUG_PORT", "9222"))  # Worker N uses BASE_DEBUG_PORT + N as its remote debugging port
+# ============================================================================
+
+def chrome_arguments(profile_dir, debug_port):
+    """Command line switches for an automation Chrome, shared by create_driver and attach mode"""
+    arguments = [f"--user-data-dir={profile_dir}"]
+
+    # Add realistic user agent
+    user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36"
+    arguments.append(f"user-agent={user_agent}")
+
+    # Conditionally add headless mode
+    if HEADLESS_MODE:
+        arguments.append("--headless=new")  # Run in headless mode (no visible browser)
+        arguments.append("--window-size=1920,1080")  # Set window size for headless mode
+        # Additional options to make headless work better
+        arguments.append("--disable-blink-features=AutomationControlled")
+        arguments.append("--disable-features=IsolateOrigins,site-per-process")
+    else:
+        arguments.append("--start-maximized")  # Start maximized when visible
+
+    arguments.append(f"--remote-debugging-port={debug_port}")  # Add debugging port
+    arguments.append("--no-sandbox")  # Bypass OS security model
+    arguments.append("--disable-dev-shm-usage")  # Overcome limited resource problems
+    arguments.append("--disable-gpu")  # Disable GPU hardware acceleration
+
+    if LEAN_MODE:
+        # Images are also turned off by content setting, which covers every tab and any file extension
+        arguments.append("--blink-settings=imagesEnabled=false")
+    return arguments
+
+def create_driver(profile_dir, debug_port):
+    """Launch a Chrome WebDriver on the given user data directory and remote debugging port"""
+    # Set up Chrome options
+    options = webdriver.ChromeOptions()
+    for argument in chrome_arguments(profile_dir, debug_port):
+        options.add_argument(argument)
+    options.add_experimental_option("excludeSwitches", ["enable-logging", "enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+
+    # Only detach if not in headless mode (so browser stays open)
+    if not HEADLESS_MODE:
+        options.add_experimental_option("detach", True)
+
+    if API_CAPTURE:
+        enable_api_capture(options)
+
+    if LEAN_MODE:
+        # Return from page loads at DOMContentLoaded; the explicit waits cover the rest
+        options.page_load_strategy = "eager"
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
+    # Set up the Service with the path to chromedriver.exe
+    service = Service(executable_path=CHROMEDRIVER_PATH)
+
+    # Initialize the WebDriver with the specified service and options
+    with tracer.span("chrome_startup", port=debug_port):
+        new_driver = webdriver.Chrome(service=service, options=options)
+    tracer.instrument(new_driver)
+    if LEAN_MODE:
+        apply_lean_blocking(new_driver)
+    return new_driver
+
+def clone_automation_profile(automation_profile, worker_index):
+    """Create a separate automation profile for a parallel worker with the same login session.
+    Chrome refuses to share a user data directory between processes, so every worker needs its own.
+    The session is copied from the source profile because the main automation profile is locked by
+    its running Chrome."""
+    worker_profile = f"{automation_profile}_worker{worker_index}"
+    if not os.path.exists(worker_profile):
+        os.makedirs(worker_profile)
+    remove_chrome_lock_files(worker_profile, "Default")
+    copy_login_session(PROFILE_PATH, PROFILE_NAME, worker_profile)
+    return worker_profile
+
+def run_games_in_parallel(games, main_driver, worker_count):
+    """Process games on a pool of worker_count isolated Chrome sessions.
+    The main driver is reused as the first worker; the rest are launched on demand with their
+    own cloned profile and debugging port. Returns {game_index: successful_joins}."""
+    idle_drivers = queue.Queue()
+    idle_drivers.put(main_driver)
+    worker_drivers = []
+    worker_lock = threading.Lock()
+
+    def run_game(game_index, game):
+        try:
+            worker_driver = idle_drivers.get_nowait()
+        except queue.Empty:
+            with worker_lock:
+                worker_index = len(worker_drivers) + 1
+                worker_drivers.append(None)
+            print(f"Starting Chrome worker {worker_index} on port {BASE_DEBUG_PORT + worker_index}...")
+            worker_driver = create_driver(clone_automation_profile(automation_profile, worker_index),
+                                          BASE_DEBUG_PORT + worker_index)
+            worker_drivers[worker_index - 1] = worker_driver
+        try:
+            with tracer.span("game", game=game['name']):
+                return process_game(worker_driver, game, game_index, len(games))
+        finally:
+            idle_drivers.put(worker_driver)
+
+    results = {}
+    try:
+        with ThreadPoolExecutor(max_workers=worker_count) as executor:
+            futures = {executor.submit(run_game, game_index, game): game_index
+                       for game_index, game in enumerate(games, 1)}
+            for future in as_completed(futures):
+                game_index = futures[future]
+                try:
+                    results[game_index] = future.result()
+                except Exception as e:
+                    print(f"⚠ Worker failed on {games[game_index - 1]['name']}: {e}")
+                    results[game_index] = 0
+    finally:
+        for worker_driver in worker_drivers:
+            if worker_driver is not None:
+                try:
+                    worker_driver.quit()
+                except Exception:
+                    pass
+    return results
+
+# ============================================================================
+# ATTACH MODE - Reuse an automation Chrome left running by an earlier run
+# ============================================================================
+ATTACH_MODE = False          # True = connect to Chrome on BASE_DEBUG_PORT (starting it if needed) and leave it running
+ATTACH_RECYCLE_RUNS = 50     # Restart the kept browser after this many runs
+ATTACH_RECYCLE_RSS_MB = 1500 # ...or once its processes use more memory than this (needs psutil)
+ATTACH_STATE_FILE = "attached_browser.json"  # Kept in the automation profile: pid, port and run count
+CHROME_PATH = os.getenv("CHROME_PATH")  # Chrome executable for attach mode (found automatically if unset)
+# ============================================================================
+
+def debug_port_listening(port):
+    """True if a Chrome DevTools endpoint answers on localhost:port"""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=1) as response:
+            return "Browser" in json.load(response)
+    except Exception:
+        return False
+
+def find_chrome_executable():
+    """CHROME_PATH, or Chrome in its usual install locations, or whatever is on the PATH"""
+    candidates = [CHROME_PATH,
+                  os.path.join(os.getenv("ProgramFiles", ""), "Google", "Chrome", "Application", "chrome.exe"),
+                  os.path.join(os.getenv("ProgramFiles(x86)", ""), "Google", "Chrome", "Application", "chrome.exe"),
+                  os.path.join(os.getenv("LOCALAPPDATA", ""), "Google", "Chrome", "Application", "chrome.exe"),
+                  "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"]
+    for candidate in candidates:
+        if candidate and os.path.isfile(candidate):
+            return candidate
+    for name in ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"):
+        if shutil.which(name):
+            return shutil.which(name)
+    raise FileNotFoundError("Chrome not found, set CHROME_PATH in your .env file")
+
+def read_attach_state(profile_dir):
+    try:
+        with open(os.path.join(profile_dir, ATTACH_STATE_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def write_attach_state(profile_dir, state):
+    with open(os.path.join(profile_dir, ATTACH_STATE_FILE), "w", encoding="utf-8") as f:
+        json.dump(state, f)
+
+def launch_automation_chrome(profile_dir, debug_port, timeout=20):
+    """Start Chrome on its own (not as a child of chromedriver) so it outlives this run"""
+    print(f"Starting automation Chrome on port {debug_port}...")
+    command = [find_chrome_executable()] + chrome_arguments(profile_dir, debug_port) + ["about:blank"]
+    if os.name == "nt":
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                   creationflags=subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP)
+    else:
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                   start_new_session=True)
+    write_attach_state(profile_dir, {"pid": process.pid, "port": debug_port, "runs": 0, "started_at": time.time()})
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if debug_port_listening(debug_port):
+            return process.pid
+        time.sleep(0.2)
+    raise RuntimeError(f"Chrome did not open its debugging port {debug_port} within {timeout}s")
+
+def stop_automation_chrome(profile_dir):
+    """Kill the kept Chrome and everything under it"""
+    pid = read_attach_state(profile_dir).get("pid")
+    if not pid:
+        return
+    try:
+        if psutil is not None:
+            root = psutil.Process(pid)
+            for process in root.children(recursive=True) + [root]:
+                process.kill()
+        elif os.name == "nt":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)], capture_output=True)
+        else:
+            os.killpg(pid, 9)
+    except Exception as e:
+        print(f"Note: Could not stop Chrome (pid {pid}): {e}")
+    write_attach_state(profile_dir, {})
+
+def chrome_tree_rss_mb(pid):
+    """Resident memory of a Chrome process tree in MB, or None without psutil"""
+    if psutil is None or not pid:
+        return None
+    tree = tracer.process_tree(pid)
+    try:
+        return sum(process.memory_info().rss for process in tree) / 2**20 if tree else None
+    except psutil.Error:
+        return None
+
+def attach_driver(profile_dir, debug_port):
+    """Connect to the automation Chrome on debug_port, starting or recycling it first when needed.
+    The browser is left running when the run ends (see detach_driver)."""
+    state = read_attach_state(profile_dir)
+    if debug_port_listening(debug_port):
+        rss_mb = chrome_tree_rss_mb(state.get("pid"))
+        if state.get("runs", 0) >= ATTACH_RECYCLE_RUNS:
+            print(f"Recycling Chrome after {state['runs']} runs...")
+            stop_automation_chrome(profile_dir)
+        elif rss_mb is not None and rss_mb > ATTACH_RECYCLE_RSS_MB:
+            print(f"Recycling Chrome, it is using {rss_mb:.0f} MB...")
+            stop_automation_chrome(profile_dir)
+    if not debug_port_listening(debug_port):
+        launch_automation_chrome(profile_dir, debug_port)
+
+    options = webdriver.ChromeOptions()
+    options.debugger_address = f"127.0.0.1:{debug_port}"
+    if LEAN_MODE:
+        options.page_load_strategy = "eager"
+    if API_CAPTURE:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    with tracer.span("chrome_attach", port=debug_port):
+        new_driver = webdriver.Chrome(service=Service(executable_path=CHROMEDRIVER_PATH), options=options)
+        try:
+            # Health check: the session has to answer and have a window to work in
+            new_driver.switch_to.window(new_driver.window_handles[0])
+            new_driver.execute_script("return 1;")
+        except Exception as e:
+            print(f"⚠ Attached Chrome is not healthy ({e}), restarting it...")
+            detach_driver(new_driver)
+            stop_automation_chrome(profile_dir)
+            launch_automation_chrome(profile_dir, debug_port)
+            new_driver = webdriver.Chrome(service=Service(executable_path=CHROMEDRIVER_PATH), options=options)
+
+    state = read_attach_state(profile_dir)
+    state["runs"] = state.get("runs", 0) + 1
+    write_attach_state(profile_dir, state)
+    tracer.instrument(new_driver)
+    if state.get("pid"):
+        tracer.browser_pids.append(state["pid"])  # Chrome isn't under our chromedriver, so track it directly
+    if LEAN_MODE:
+        apply_lean_blocking(new_driver)
+    return new_driver
+
+def detach_driver(driver):
+    """Stop our chromedriver without ending the session, which would close the kept Chrome"""
+    try:
+        driver.service.stop()
+    except Exception:
+        pass
+
+def start_browser():
+    """The main browser for a run: attached to the kept Chrome in attach mode, otherwise a new one"""
+    prepare_automation_profile()
+    if ATTACH_MODE:
+        return attach_driver(automation_profile, BASE_DEBUG_PORT)
+    return create_driver(automation_profile, BASE_DEBUG_PORT)
+
+# ============================================================================
+# WATCHDOG - Keep the browser's memory and CPU in check during long runs (needs psutil)
+# ============================================================================
+WATCHDOG = True                  # Sample the browser's processes and recycle it when it grows too big
+WATCHDOG_MAX_RSS_MB = 2500       # Restart the browser between games above this much memory...
+WATCHDOG_MAX_CPU_PERCENT = 300   # ...or above this average CPU over the last game (summed over processes)
+MAX_BROWSER_RESTARTS = 2         # Times a browser that dies while joining is restarted and resumed, per run
+RENDERER_SPARE = 1               # Renderer processes Chrome may keep beyond one per open tab unreported
+# ============================================================================
+
+class ResourceWatchdog:
+    """Judges the browser's memory and CPU from the tracer's background samples (see run_trace.py),
+    counts renderer processes beyond the open tabs, and decides when the browser should be
+    restarted. Times passed in are time.perf_counter() values, the tracer's clock."""
+
+    def __init__(self):
+        self.restarts = 0
+        self.excess_renderers = 0
+
+    def reset(self):
+        """Start a new run's report"""
+        self.restarts = 0
+        self.excess_renderers = 0
+
+    def samples_since(self, since):
+        """(time, RSS MB, CPU %, process count) samples since then; none with the watchdog off"""
+        if not WATCHDOG or psutil is None:
+            return []
+        return [(t, rss / 2**20, cpu, count) for t, rss, cpu, count in tracer.samples_since(since)]
+
+    def over_limits(self, since):
+        """The reason the browser should be restarted, judged on samples since then; None if it's fine"""
+        samples = self.samples_since(since)
+        if not samples:
+            return None
+        rss = samples[-1][1]
+        cpu = sum(sample[2] for sample in samples) / len(samples)
+        if rss > WATCHDOG_MAX_RSS_MB:
+            return f"using {rss:.0f} MB"
+        if cpu > WATCHDOG_MAX_CPU_PERCENT:
+            return f"averaging {cpu:.0f}% CPU"
+        return None
+
+    def count_excess_renderers(self, driver):
+        """Count the renderer processes that outnumber the open tabs and keep the run's peak.
+        Only reported: nothing maps a renderer to its tab, so there's no telling which are stale."""
+        if not WATCHDOG or psutil is None:
+            return 0
+        try:
+            open_tabs = len(driver.window_handles)
+        except Exception:
+            return 0
+        renderers = 0
+        for process in tracer.chrome_processes():
+            try:
+                cmdline = process.cmdline()
+                if "--type=renderer" in cmdline and "--extension-process" not in cmdline:
+                    renderers += 1
+            except psutil.Error:
+                pass
+        excess = max(renderers - open_tabs - RENDERER_SPARE, 0)
+        if excess:
+            print(f"Watchdog: {renderers} renderer process(es) for {open_tabs} open tab(s)")
+        self.excess_renderers = max(self.excess_renderers, excess)
+        return excess
+
+    def checkpoint(self, driver, since):
+        """Between games: restart the browser if it has grown past the limits since then.
+        Returns the driver to carry on with."""
+        reason = self.over_limits(since)
+        if reason is None:
+            return driver
+        print(f"\n⚠ Watchdog: browser is {reason}, restarting it before the next game")
+        return self.recycle(driver)
+
+    def recycle(self, driver):
+        """Replace the browser with a fresh one"""
+        try:
+            if ATTACH_MODE:
+                detach_driver(driver)
+                stop_automation_chrome(automation_profile)
+            else:
+                driver.quit()
+        except Exception:
+            pass
+        self.restarts += 1
+        return start_browser()
+
+    def report(self, since):
+        """Resource totals for the run summary (None without psutil or samples)"""
+        samples = self.samples_since(since)
+        if not samples:
+            return None
+        return {"samples": len(samples),
+                "peak_rss_mb": round(max(sample[1] for sample in samples)),
+                "average_cpu_percent": round(sum(sample[2] for sample in samples) / len(samples)),
+                "peak_processes": max(sample[3] for sample in samples),
+                "restarts": self.restarts,
+                "excess_renderers": self.excess_renderers}
+
+    def print_report(self, since):
+        report = self.report(since)
+        if report is None:
+            return
+        run_summary["resources"] = report
+        print("\n" + "="*70)
+        print("  BROWSER RESOURCES")
+        print("="*70)
+        print(f"Peak memory: {report['peak_rss_mb']} MB over {report['peak_processes']} process(es) at most")
+        print(f"Average CPU: {report['average_cpu_percent']}% ({report['samples']} sample(s))")
+        print(f"Browser restarts: {report['restarts']}, most renderers beyond open tabs: {report['excess_renderers']}")
+        print("="*70)
+
+watchdog = ResourceWatchdog()
+
+# Load configuration from .env file
+SITE_URL = os.getenv("REPEAT_GG_SITE_URL", "https://www.repeat.gg").rstrip("/")  # Override to test against a local stand-in
+PROFILE_PATH = os.getenv("PROFILE_PATH")
+PROFILE_NAME = os.getenv("PROFILE_NAME")
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH")
+
+automation_profile = os.getenv("AUTOMATION_PROFILE_DIR") or os.path.join(os.getcwd(), "chrome_automation_profile")
+profile_prepared = False
+
+def prepare_automation_profile():
+    """Create the automation profile and copy the login session into it, once per process"""
+    global profile_prepared
+    if profile_prepared:
+        return
+    profile_prepared = True
+
+    # Create automation profile directory
+    if not os.path.exists(automation_profile):
+        os.makedirs(automation_profile)
+        print(f"Created automation profile directory: {automation_profile}")
+
+    # Copy login session from Profile 6 to automation profile for auto-login
+    if ATTACH_MODE and debug_port_listening(BASE_DEBUG_PORT):
+        print("Automation Chrome is already running, keeping its session")  # Its profile is in use
+    else:
+        print("Copying login session from Profile 6...")
+        with tracer.span("copy_login_session"):
+            copy_login_session(PROFILE_PATH, PROFILE_NAME, automation_profile)
+
+# ============================================================================
+# GAMES LIST - Add or remove games as needed, or list them in games.toml (see games.example.toml)
+# ============================================================================
+# Each game is a "path" on SITE_URL (resolved when the games are loaded) or a full "url"
+GAMES_LIST = [
+    {"name": "League of Legends", "path": "/pc/league-of-legends"},
+    {"name": "Rocket League", "path": "/pc/rocket-league"},
+    {"name": "Brawl Stars", "path": "/mobile/brawl-stars"}
+]
+# .toml, or .yaml/.yml with PyYAML installed. Defaults to games.toml next to this file, whatever the
+# working directory (run_accounts.py runs each account from its own folder)
+GAMES_CONFIG_FILE = os.getenv("GAMES_CONFIG") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "games.toml")
+# ============================================================================
+
+TEAM_SIZE_WORDS = {"solo": 1, "solos": 1, "duo": 2, "duos": 2, "trio": 3, "trios": 3, "squad": 4, "squads": 4}
+
+def load_games_config(path):
+    """Read games and filter rules from a TOML or YAML file. Returns None if the file doesn't exist."""
+    if not os.path.isfile(path):
+        return None
+    if path.endswith((".yaml", ".yml")):
+        import yaml  # Optional dependency, only needed for YAML configs
+        with open(path, "r", encoding="utf-8") as f:
+            return yaml.safe_load(f) or {}
+    try:
+        import tomllib
+    except ImportError:
+        import tomli as tomllib  # Python 3.10 and older
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+def row_team_size(row):
+    """Players per team from the row data, or from the name ("2v2", "Duos"); None if unknown"""
+    if row.get("team_size"):
+        return int(row["team_size"])
+    name = (row.get("name") or "").lower()
+    match = re.search(r'\b(\d+)\s?v\s?\d+\b', name)
+    if match:
+        return int(match.group(1))
+    return next((size for word, size in TEAM_SIZE_WORDS.items() if re.search(rf'\b{word}\b', name)), None)
+
+def compile_row_filter(rules):
+    """Turn filter rules into one predicate over list-row records. The predicate returns None for a
+    tournament that passes, or the name of the first rule it fails. Unknown data passes."""
+    checks = []
+    for rule, value in rules.items():
+        if rule == "min_prize_usd":
+            checks.append((rule, lambda row, now, value=float(value):
+                           prize_value_usd(row) is None or prize_value_usd(row) >= value))
+        elif rule == "currencies":
+            allowed = {currency.upper() for currency in value}
+            checks.append((rule, lambda row, now, allowed=allowed: not row.get("currency") or row["currency"] in allowed))
+        elif rule in ("min_hours_to_start", "max_hours_to_start"):
+            def check_start(row, now, rule=rule, hours=float(value)):
+                starts_at = parse_tournament_date(row.get("start_time"), now)
+                if starts_at is None:
+                    return True
+                hours_to_start = (starts_at - now).total_seconds() / 3600
+                return hours_to_start >= hours if rule == "min_hours_to_start" else hours_to_start <= hours
+            checks.append((rule, check_start))
+        elif rule == "exclude_keywords":
+            keywords = [keyword.lower() for keyword in value]
+            checks.append((rule, lambda row, now, keywords=keywords:
+                           not any(keyword in (row.get("name") or "").lower() for keyword in keywords)))
+        elif rule == "max_team_size":
+            checks.append((rule, lambda row, now, value=int(value):
+                           row_team_size(row) is None or row_team_size(row) <= value))
+        else:
+            raise ValueError(f"Unknown filter rule: {rule}")
+
+    def row_filter(row, now=None):
+        now = now or datetime.now()
+        for rule, check in checks:
+            if not check(row, now):
+                return rule
+        return None
+    return row_filter
+
+def games_from_config(config, default_games):
+    """Build the games list from a parsed config. Top-level [filters] apply to every game and a
+    game's own filters override them. Without [[games]] the built-in list gets the filters."""
+    default_rules = config.get("filters") or {}
+    entries = config.get("games") or [dict(game, filters={}) for game in default_games]
+    games = []
+    for entry in entries:
+        url = entry.get("url") or f"{SITE_URL}/{entry['path'].strip('/')}"
+        rules = dict(default_rules, **(entry.get("filters") or {}))
+        games.append({"name": entry["name"], "url": url,
+                      "filter": compile_row_filter(rules) if rules else None,
+                      "filter_rules": json.dumps(rules, sort_keys=True, default=str)})
+    return games
+
+def apply_game_filter(game, rows):
+    """Drop the rows a game's config rules rule out, before any tab is opened"""
+    row_filter = game.get("filter")
+    if not row_filter:
+        return rows
+    kept = []
+    rejected = {}
+    now = datetime.now()
+    for row in rows:
+        rule = row_filter(row, now)
+        if rule:
+            rejected[rule] = rejected.get(rule, 0) + 1
+        else:
+            kept.append(row)
+    if rejected:
+        print(f"Ruled out {sum(rejected.values())} tournament(s) by config rules ("
+              + ", ".join(f"{rule}: {count}" for rule, count in rejected.items()) + ")")
+    return kept
+
+def load_games():
+    """GAMES_CONFIG_FILE's games and rules if the file exists, otherwise the built-in GAMES_LIST"""
+    try:
+        games_config = load_games_config(GAMES_CONFIG_FILE)
+        if games_config is not None:
+            games = games_from_config(games_config, GAMES_LIST)
+            print(f"Loaded {len(games)} game(s) from {GAMES_CONFIG_FILE}")
+            return games
+    except Exception as e:
+        print(f"⚠ Could not read {GAMES_CONFIG_FILE} ({e}), using the built-in games list")
+    return games_from_config({}, GAMES_LIST)
+
+def process_tournament_tab(driver, game, tab_number, link, previous_url="about:blank"):
+    """Check, log and join the tournament open in the current tab. Outcomes are recorded under
+    link, the listing href the tab was opened with, so the ledger matches the listing even if the
+    site redirected the tab. previous_url is the page a reused tab showed before link was loaded.
+    Returns True if the join was successful."""
+    try:
+        with tracer.span("tab_load"):
+            # Wait for the page to load
+            if not wait_for_page_ready(driver, timeout=10):
+                print(f"Page in tab {tab_number} didn't load properly, skipping...")
+                return False
+            # A reused tab that timed out may still show the previous tournament: never act on it
+            if driver.current_url == previous_url:
+                print(f"Tab {tab_number} is still on the previous tournament, skipping...")
+                return False
+
+        # Since we already verified these are free tournaments, proceed directly
+        print(f"Processing tournament in tab {tab_number} for {game['name']}")
+
+        with tracer.span("tab_render"):
+            # Wait for tournament header to load, then for React to finish rendering the page
+            try:
+                WebDriverWait(driver, 10, poll_frequency=WAIT_POLL_INTERVAL).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, TOURNAMENT_HEADER_SELECTOR))
+                )
+                wait_for_dom_quiet(driver, timeout=5)
+            except:
+                print(f"Tournament header not found in tab {tab_number}, skipping...")
+                return False
+
+        with tracer.span("tab_details"):
+            # Read name, dates, prize pool and join state in one round trip
+            detail = extract_tournament_detail(driver)
+            if API_CAPTURE:
+                detail = apply_captured_detail(driver, detail)
+            tourney_url = link
+            tourney_name_text = detail["name"]
+            matches = detail["dates"]
+            prize_text = detail["prize"]
+            prize_currency = detail["currency"]
+
+            # Double-check that this is still a free entry tournament on the individual page
+            if not detail["free"]:
+                print(f"Tournament in tab {tab_number} is not free entry, skipping...")
+                record_outcome(game, tourney_url, "not_free")
+                return False
+
+            if tourney_name_text:
+                print("Tournament Name: " + tourney_name_text)
+            else:
+                print("Error finding tournament name")
+
+            if matches:
+                print("Dates: " + ' ⟶ '.join(matches))
+            else:
+                print("No dates found.")
+
+            if prize_currency == "USD":
+                print("USD: " + prize_text)
+            elif prize_currency == "PM":
+                print("Coins: " + prize_text)
+            else:
+                print("Error finding prize pool")
+
+            if detail["join_state"] == "joined":
+                print("Already joined this tournament, skipping...")
+                print('|--------------------------------------------------------------------|')
+                record_outcome(game, tourney_url, "joined", name=tourney_name_text,
+                               prize=prize_text, currency=prize_currency, dates=matches)
+                return False
+
+            if detail["join_state"] in ("disabled", "missing"):
+                # No usable Join Tournament button: leave it without an outcome so it is tried again
+                print(f"Join button is {detail['join_state']}, skipping for now...")
+                print('|--------------------------------------------------------------------|')
+                return False
+
+        with tracer.span("join"):
+            # Join Button
+            try:
+                # Find the join button - look for button containing "Join Tournament" text, or with
+                # "Join Tournament" in any child element (both are checked on every poll)
+                join_button = wait_for_clickable(driver, [
+                    (By.XPATH, "//button[contains(text(), 'Join Tournament')]"),
+                    (By.XPATH, "//button[.//text()[contains(., 'Join Tournament')]]")
+                ], timeout=10, step="join_button")
+                if join_button is None:
+                    raise Exception("'Join Tournament' button not found or not clickable")
+            
+                # Click, then check to see if there is an error msg when joining tourney
+                modal_element = click_and_wait_for_modal(driver, join_button)
+                if modal_element:
+                    print("\nJoin Unsuccessful")
+                    reason_text = None
+
+                    # Print the contents of the h2 tag (Header of Reason for not being able to join tourney)
+                    try:
+                        h2_element = modal_element.find_element(By.TAG_NAME, 'h2')
+                        reason_text = h2_element.text
+                        print("Reason: " + reason_text)
+                    except Exception as e:
+                        print(f"Error finding reason: {e}")
+                
+                    # Print the contents of all p tags (Explanation to Reason for not being able to join tourney)
+                    try:
+                        p_elements = modal_element.find_elements(By.TAG_NAME, 'p')
+                        for p in p_elements:
+                            print(p.text)
+                        print('\n|--------------------------------------------------------------------|')
+                    except Exception as e:
+                        print(f"Error finding explanation for reason: {e}")
+
+                    record_outcome(game, tourney_url, "rejected", reason=reason_text, name=tourney_name_text,
+                                   prize=prize_text, currency=prize_currency, dates=matches)
+                else:
+                    # If the modal never appeared, the join was successful
+                    record_outcome(game, tourney_url, "joined", name=tourney_name_text,
+                                   prize=prize_text, currency=prize_currency, dates=matches)
+                    print("Successfully Joined Tourney")
+                    print('|--------------------------------------------------------------------|')
+                    return True
+            except Exception as e:
+                print(f"Error clicking join button: {e}")
+                print('|--------------------------------------------------------------------|')
+
+    except Exception as e:
+        print(f"Error processing tournament in tab {tab_number}: {e}")
+        print('|--------------------------------------------------------------------|')
+    return False
+
+def run_tab_pipeline(driver, jobs, deadline=None):
+    """Load (game, link) jobs through at most TAB_WINDOW tabs, handling whichever tab is ready first
+    and navigating it straight on to the next link. No new link is started once the time.monotonic()
+    deadline has passed. Returns (joined jobs, page weight, tabs used, jobs deferred, jobs
+    unresolved). If the browser stops responding, the pipeline stops and returns the jobs it hadn't
+    finished as deferred, so the caller can restart the browser and resume them. Page weight maps
+    each game URL to [bytes, requests, pages] for its tabs; unresolved jobs were opened but ended
+    without an outcome in the join ledger (page didn't render, join button timed out, an error)
+    and are retried on the next run."""
+    main_handle = driver.current_window_handle
+    pending = list(jobs)
+    slots = []  # {handle, job, previous_url, started, tab_number}
+    in_flight = []  # Jobs taken from pending that haven't been handled yet
+    joined = []
+    unresolved = []
+    page_weight = {}
+    tab_number = 0
+
+    def load_next(slot):
+        nonlocal tab_number
+        tab_number += 1
+        slot.update(job=pending.pop(0), started=time.monotonic(), tab_number=tab_number)
+        in_flight.append(slot["job"])
+        driver.execute_script("window.location.href = arguments[0];", slot["job"][1])
+
+    def out_of_time():
+        return deadline is not None and time.monotonic() > deadline
+
+    tabs_used = 0
+    try:
+        with tracer.span("open_tabs"):
+            for _ in range(min(TAB_WINDOW, len(pending))):
+                if out_of_time():
+                    break
+                slot = {"handle": open_pipeline_tab(driver), "previous_url": "about:blank"}
+                load_next(slot)
+                slots.append(slot)
+            tabs_used = len(slots)
+
+        while slots:
+            # Poll the open tabs round-robin until one has rendered (or has run out of time)
+            ready = None
+            while ready is None:
+                for slot in slots:
+                    try:
+                        driver.switch_to.window(slot["handle"])
+                        probe = read_readiness_probe(driver, TOURNAMENT_HEADER_SELECTOR)
+                        if tab_is_ready(probe, slot["previous_url"]):
+                            ready = slot
+                            break
+                    except Exception:
+                        pass  # Mid-navigation; check again next round
+                    if time.monotonic() - slot["started"] > TAB_READY_TIMEOUT:
+                        ready = slot
+                        break
+                else:
+                    time.sleep(WAIT_POLL_INTERVAL)
+
+            game = ready["job"][0]
+            with tracer.span("tab", game=game['name'], tab=ready["tab_number"]):
+                try:
+                    driver.switch_to.window(ready["handle"])
+                except Exception as e:
+                    if not browser_alive(driver):
+                        raise
+                    print(f"Error processing tournament in tab {ready['tab_number']}: {e}")
+                    print('|--------------------------------------------------------------------|')
+                    slots.remove(ready)
+                    in_flight.remove(ready["job"])
+                    unresolved.append(ready["job"])
+                    continue
+                if process_tournament_tab(driver, game, ready["tab_number"], ready["job"][1], ready["previous_url"]):
+                    joined.append(ready["job"])
+                elif join_ledger.filter_new([ready["job"][1]]):
+                    if not browser_alive(driver):
+                        raise RuntimeError("browser stopped responding while the tab was handled")
+                    unresolved.append(ready["job"])
+                in_flight.remove(ready["job"])
+
+            # Count what this page downloaded before the tab moves on or closes
+            tab_bytes, tab_requests = page_transfer_stats(driver)
+            weight = page_weight.setdefault(game['url'], [0, 0, 0])
+            weight[0] += tab_bytes
+            weight[1] += tab_requests
+            weight[2] += 1
+            if pending and not out_of_time():
+                ready["previous_url"] = driver.current_url
+                load_next(ready)
+            else:
+                with tracer.span("close_tabs"):
+                    driver.close()
+                slots.remove(ready)
+        driver.switch_to.window(main_handle)
+    except Exception as e:
+        if browser_alive(driver):
+            raise
+        # Chrome died: hand back everything that hadn't finished so it can be resumed
+        print(f"\n⚠ Browser stopped responding ({e})")
+        return joined, page_weight, tabs_used, in_flight + pending, unresolved
+    return joined, page_weight, tabs_used, pending, unresolved
+
+def load_listing(driver, game):
+    """Read one game's tournament rows, from another account's shared listing, the page's API
+    response or the rendered page. Returns (rows, bytes, requests), rows None if nothing loaded."""
+    # Another account may already have loaded this game page
+    tournament_rows = fetch_shared_listing(game['url'])
+    if tournament_rows is not None:
+        latest_listings[game['url']] = tournament_rows
+        print(f"Using the tournament listing shared by another account ({len(tournament_rows)} tournament(s))")
+        game_bytes = game_requests = 0
+    else:
+        # Whatever happens while loading, other accounts must not be left waiting on the lock
+        try:
+            tournament_rows = None
+            with tracer.span("game_page_load"):
+                # Navigate to the game's tournament page
+                if API_CAPTURE:
+                    capture_for(driver).poll(driver)  # Skip anything logged by earlier pages
+                    since = capture_for(driver).mark()
+                driver.get(game['url'])
+
+                if API_CAPTURE:
+                    # Move on as soon as the listing data arrives, without waiting for rows to render
+                    payload = wait_for_api_payload(driver, "tournament_list", since)
+                    items = unwrap_list(payload, "tournaments") if payload is not None else None
+                    captured_rows = [normalize_tournament(item) for item in items] if items is not None else None
+                    if captured_rows is not None and captured_rows_usable(captured_rows):
+                        tournament_rows = captured_rows
+                        print("✓ Tournament data captured from the page's API response")
+                    elif captured_rows is not None:
+                        print("⚠ Captured tournament data doesn't look like a listing, reading the page instead")
+                    else:
+                        print("⚠ No tournament data response captured, reading the page instead")
+
+                if tournament_rows is None:
+                    # Wait for tournament elements to load (explicit wait for React)
+                    print("Waiting for tournaments to load...")
+                    try:
+                        WebDriverWait(driver, 15, poll_frequency=WAIT_POLL_INTERVAL).until(
+                            EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="tournament row"]'))
+                        )
+                        print("✓ Tournaments loaded!")
+                        wait_for_dom_quiet(driver, timeout=5)  # Let React finish rendering the remaining rows
+                    except:
+                        print("⚠ No tournaments found or page didn't load properly")
+                        latest_listings[game['url']] = []
+                        publish_shared_listing(game['url'], [])
+                        return None, 0, 0
+
+            with tracer.span("row_extraction"):
+                # Read every tournament row on the page in a single round trip
+                if tournament_rows is None:
+                    tournament_rows = extract_tournament_rows(driver)
+                latest_listings[game['url']] = tournament_rows
+                publish_shared_listing(game['url'], tournament_rows)
+                print(f"Found {len(tournament_rows)} tournament(s) on the page")
+                game_bytes, game_requests = page_transfer_stats(driver)
+        finally:
+            release_shared_listing(game['url'])
+    return tournament_rows, game_bytes, game_requests
+
+def scan_game(driver, game, game_index, game_count):
+    """Load one game's listing and work out which of its tournaments need opening.
+    Returns a dict with the game, its rows, the links to open, the listing fingerprint and
+    next boundary, and the page weight so far; or None when there is nothing to open."""
+    print("\n" + "="*70)
+    print(f"  [{game_index}/{game_count}] Checking {game['name']}...")
+    print("="*70)
+
+    tournament_rows, game_bytes, game_requests = load_listing(driver, game)
+    if tournament_rows is None:
+        return None  # Skip to next game if no tournaments found
+
+    # Nothing to do if the listing (and the rules applied to it) are the same as when its tournaments
+    # were last handled
+    fingerprint, next_boundary = listing_fingerprint(tournament_rows, rules=game.get("filter_rules"))
+    if SKIP_UNCHANGED_LISTINGS and join_ledger.listing_unchanged(game['url'], fingerprint):
+        print(f"✓ {game['name']} listing unchanged since the last run, skipping its tournaments")
+        return None
+
+    # Store the qualifying tournament links, after the config rules have had their say
+    qualifying = apply_game_filter(game, [row for row in tournament_rows if row_qualifies(row)])
+    tournament_links = [row["href"] for row in qualifying]
+
+    if len(tournament_links) == 0:
+        print(f"⚠ No qualifying free tournaments found for {game['name']}")
+        join_ledger.record_listing(game['url'], fingerprint, next_boundary)
+        return None  # Skip to next game if no qualifying tournaments
+
+    print(f"Found {len(tournament_links)} qualifying tournament(s) for {game['name']}")
+
+    # Drop tournaments the ledger already has an outcome for, before opening any tabs
+    new_links = join_ledger.filter_new(tournament_links)
+    if len(new_links) < len(tournament_links):
+        print(f"Skipping {len(tournament_links) - len(new_links)} tournament(s) already in the join ledger")
+    tournament_links = new_links
+    if len(tournament_links) == 0:
+        print(f"✓ Nothing new to join for {game['name']}")
+        join_ledger.record_listing(game['url'], fingerprint, next_boundary)
+        return None
+
+    return {"game": game, "rows": tournament_rows, "links": tournament_links, "fingerprint": fingerprint,
+            "next_boundary": next_boundary, "bytes": game_bytes, "requests": game_requests}
+
+def process_game(driver, game, game_index, game_count):
+    """Find, open and join every qualifying free tournament for one game.
+    Returns the number of tournaments successfully joined."""
+    scan = scan_game(driver, game, game_index, game_count)
+    if scan is None:
+        return 0
+
+    print('\n|--------------------------------------------------------------------|')
+    joined, page_weight, tab_count, unfinished, unresolved = run_tab_pipeline(
+        driver, [(game, link) for link in scan["links"]])
+    if unfinished:
+        # Only a dead browser leaves jobs unfinished without a deadline; run_games restarts it
+        raise RuntimeError(f"browser stopped responding with {len(unfinished)} tournament(s) left")
+    tab_bytes, tab_requests, _ = page_weight.get(game['url'], [0, 0, 0])
+    # Tournaments that failed without an outcome must be retried, so the listing isn't handled yet
+    if not unresolved:
+        join_ledger.record_listing(game['url'], scan["fingerprint"], scan["next_boundary"])
+    game_successful_joins = len(joined)
+    game_bytes = scan["bytes"] + tab_bytes
+    game_requests = scan["requests"] + tab_requests
+    
+    # Display summary for this game
+    print(f"\n{game['name']} Summary: {game_successful_joins} tournament(s) successfully joined")
+    print(f"Page weight: {game_bytes / 1024:.0f} KB over {game_requests} request(s) "
+          f"(game page + {len(scan['links'])} tournament page(s) in {tab_count} tab(s)"
+          f"{', lean mode' if LEAN_MODE else ''})")
+    return game_successful_joins
+
+def prize_value_usd(row):
+    """A tournament's prize pool in dollars, with PM coins converted at COINS_PER_USD (None if unknown)"""
+    match = re.search(r'(\d+(?:,\d{3})*(?:\.\d+)?)', str(row.get("prize") or ""))
+    if not match:
+        return None
+    amount = float(match.group(1).replace(',', ''))
+    return amount / COINS_PER_USD if row.get("currency") == "PM" else amount
+
+def plan_tournaments(scans, now=None):
+    """Order every tournament to open across all scanned games: the ones whose registration closes
+    within URGENT_WINDOW_MINUTES first, then the rest, each group by prize value and then by
+    closing time. Returns a list of plan entries (game, link, value, closes_at)."""
+    now = now or datetime.now()
+    plan = []
+    for scan in scans:
+        rows = {row["href"]: row for row in scan["rows"]}
+        for link in scan["links"]:
+            row = rows.get(link, {})
+            closes_at = parse_tournament_date(row.get("start_time"), now)
+            plan.append({"game": scan["game"], "link": link, "name": row.get("name") or link,
+                         "value": prize_value_usd(row) or 0.0, "closes_at": closes_at})
+
+    def priority(entry):
+        closes_at = entry["closes_at"]
+        urgent = closes_at is not None and closes_at - now <= timedelta(minutes=URGENT_WINDOW_MINUTES)
+        return (not urgent, -entry["value"], closes_at or datetime.max)
+    return sorted(plan, key=priority)
+
+def run_games_planned(driver, games):
+    """Scan every game first, then open the tournaments across all games in plan order, within
+    RUN_BUDGET_MINUTES. Returns ({game_index: successful_joins}, driver)."""
+    run_deadline = time.monotonic() + RUN_BUDGET_MINUTES * 60 - CLAIM_RESERVE_SECONDS
+    game_results = {game_index: 0 for game_index in range(1, len(games) + 1)}
+    scans = []
+    skipped_games = []
+    since = time.perf_counter()
+    for game_index, game in enumerate(games, 1):
+        if time.monotonic() > run_deadline:
+            skipped_games.append(game)
+            continue
+        driver = watchdog.checkpoint(driver, since)
+        since = time.perf_counter()
+        with tracer.span("game_scan", game=game['name']):
+            try:
+                scan = scan_game(driver, game, game_index, len(games))
+            except Exception as e:
+                if browser_alive(driver):
+                    raise
+                print(f"\n⚠ Browser stopped responding during {game['name']} ({e}), restarting it")
+                driver = watchdog.recycle(driver)
+                scan = scan_game(driver, game, game_index, len(games))
+        if scan is not None:
+            scans.append(scan)
+
+    plan = plan_tournaments(scans)
+    if plan:
+        print("\n" + "="*70)
+        print(f"  Joining {len(plan)} tournament(s) across {len(scans)} game(s), highest priority first")
+        print("="*70)
+        for entry in plan[:5]:
+            closes = f"closes {entry['closes_at']:%b %d %I:%M %p}" if entry["closes_at"] else "closing time unknown"
+            print(f"  ${entry['value']:.2f}  {closes}  {entry['game']['name']}: {entry['name']}")
+        if len(plan) > 5:
+            print(f"  ... and {len(plan) - 5} more")
+        print('\n|--------------------------------------------------------------------|')
+
+        driver = watchdog.checkpoint(driver, since)
+        joined, page_weight, unresolved = [], {}, []
+        deferred = [(entry["game"], entry["link"]) for entry in plan]
+        with tracer.span("plan"):
+            for attempt in range(MAX_BROWSER_RESTARTS + 1):
+                if attempt:
+                    # The browser died mid-plan: start a new one and resume what hadn't finished
+                    print(f"⚠ Restarting the browser and resuming {len(deferred)} tournament(s)")
+                    driver = watchdog.recycle(driver)
+                # Leave room for the last tab to finish before the budget runs out
+                run_joined, run_weight, _, deferred, run_unresolved = run_tab_pipeline(
+                    driver, deferred, deadline=run_deadline - TAB_READY_TIMEOUT)
+                joined += run_joined
+                unresolved += run_unresolved
+                for game_url, weight in run_weight.items():
+                    totals = page_weight.setdefault(game_url, [0, 0, 0])
+                    page_weight[game_url] = [total + value for total, value in zip(totals, weight)]
+                if not deferred or browser_alive(driver) or time.monotonic() > run_deadline - TAB_READY_TIMEOUT:
+                    break
+            if not browser_alive(driver):
+                driver = watchdog.recycle(driver)  # Leave a working browser for the prize claims
+        for game, _ in joined:
+            game_results[games.index(game) + 1] += 1
+        watchdog.count_excess_renderers(driver)
+    else:
+        page_weight, deferred, unresolved = {}, [], []
+
+    # A game's listing only counts as handled once every one of its tournaments got an outcome:
+    # none were deferred and none failed
+    unhandled_games = {game['url'] for game, _ in deferred + unresolved}
+    for scan in scans:
+        if scan["game"]['url'] not in unhandled_games:
+            join_ledger.record_listing(scan["game"]['url'], scan["fingerprint"], scan["next_boundary"])
+
+    scanned = {scan["game"]['url']: scan for scan in scans}
+    for game_index, game in enumerate(games, 1):
+        print(f"{game['name']} Summary: {game_results[game_index]} tournament(s) successfully joined")
+        if game['url'] in scanned:
+            tab_bytes, tab_requests, tab_pages = page_weight.get(game['url'], [0, 0, 0])
+            print(f"Page weight: {(scanned[game['url']]['bytes'] + tab_bytes) / 1024:.0f} KB over "
+                  f"{scanned[game['url']]['requests'] + tab_requests} request(s) "
+                  f"(game page + {tab_pages} tournament page(s){', lean mode' if LEAN_MODE else ''})")
+    if deferred or skipped_games:
+        print(f"\n⚠ Run budget of {RUN_BUDGET_MINUTES} minute(s) reached")
+        if skipped_games:
+            print(f"Games not checked: {', '.join(game['name'] for game in skipped_games)}")
+        if deferred:
+            print(f"Deferred to the next run: {len(deferred)} tournament(s)")
+            deferred_links = {link for _, link in deferred}
+            for entry in [entry for entry in plan if entry["link"] in deferred_links][:5]:
+                print(f"  ${entry['value']:.2f}  {entry['game']['name']}: {entry['name']}")
+    run_summary["deferred"] = len(deferred)
+    return game_results, driver
+
+def run_games(driver, games):
+    """Process every game in the browser: in parallel across worker sessions when enabled,
+    otherwise as one prioritised plan under the run budget (or game by game without one).
+    Returns ({game_index: successful_joins}, driver); the driver is new if the watchdog restarted it."""
+    if PARALLEL_WORKERS > 1 and len(games) > 1:
+        game_results = run_games_in_parallel(games, driver, min(PARALLEL_WORKERS, len(games)))
+        print("\n" + "="*70)
+        print("  Per-game results")
+        print("="*70)
+        for game_index, game in enumerate(games, 1):
+            print(f"{game['name']} Summary: {game_results.get(game_index, 0)} tournament(s) successfully joined")
+        return game_results, driver
+
+    if RUN_BUDGET_MINUTES:
+        return run_games_planned(driver, games)
+
+    game_results = {}
+    since = time.perf_counter()
+    for game_index, game in enumerate(games, 1):
+        driver = watchdog.checkpoint(driver, since)
+        since = time.perf_counter()
+        with tracer.span("game", game=game['name']):
+            try:
+                game_results[game_index] = process_game(driver, game, game_index, len(games))
+            except Exception as e:
+                if browser_alive(driver):
+                    raise
+                # The browser died mid-game: start a new one and redo this game
+                print(f"\n⚠ Browser stopped responding during {game['name']} ({e}), restarting it")
+                driver = watchdog.recycle(driver)
+                game_results[game_index] = process_game(driver, game, game_index, len(games))
+        watchdog.count_excess_renderers(driver)
+    return game_results, driver
+
+def claim_prizes(driver):
+    """Open the claim prizes page and click every enabled "Claim Prize" button"""
+    with tracer.span("claim_page_load"):
+        # Refresh the main page
+        print("\n" + "="*70)
+        print("  Refreshing main page...")
+        print("="*70)
+        driver.refresh()
+        wait_for_network_idle(driver, timeout=10)
+
+        # Navigate to claim prizes page
+        print("\n" + "="*70)
+        print("  Navigating to claim prizes page...")
+        print("="*70)
+        if API_CAPTURE:
+            capture_for(driver).poll(driver)
+            since = capture_for(driver).mark()
+        driver.get(f"{SITE_URL}/marketplace/claim-prizes")
+
+        # Wait for page to load with explicit wait
+        print("Waiting for claim prizes page to load...")
+        try:
+            WebDriverWait(driver, 15).until(
+                EC.presence_of_element_located((By.TAG_NAME, "button"))
+            )
+            print("✓ Page loaded!")
+            # Give React time to fetch and render all prize cards
+            wait_for_network_idle(driver, timeout=10)
+            wait_for_dom_quiet(driver, timeout=5)
+        except:
+            print("⚠ Claim prizes page didn't load properly")
+
+    with tracer.span("claim_loop"):
+        # Click all individual "Claim Prize" buttons
+        try:
+            print("\n" + "="*70)
+            print("  Attempting to claim individual prizes...")
+            print("="*70)
+
+            # Read every prize card in one script call, trying each card selector variant at once
+            card_selectors = locator_cache.ordered("prize_card", PRIZE_CARD_SELECTORS)
+            card_scan = driver.execute_script(PRIZE_CARDS_JS, card_selectors)
+            locator_cache.record("prize_card", card_selectors, card_scan["matched"])
+            prize_cards = card_scan["cards"]
+
+            # Prize values straight from the page's API response, when it lines up with the cards
+            captured_prizes = None
+            if API_CAPTURE:
+                capture_for(driver).poll(driver)
+                payload = capture_for(driver).latest("prizes", since)
+                items = unwrap_list(payload, "prizes", "rewards") if payload is not None else None
+                if items is not None and len(items) == len(prize_cards):
+                    captured_prizes = [normalize_prize_card(item) for item in items]
+            print(f"Found {len(prize_cards)} prize article(s) on the page")
+
+            if len(prize_cards) == 0:
+                print("⚠ No prize articles found on the page")
+                print("This may be because you have no prizes to claim or the page layout changed.")
+                return
+
+            eligible = []
+            prize_values = {}
+            prize_records = {}
+            for i, card in enumerate(prize_cards, 1):
+                if captured_prizes:
+                    prize_value, currency_type = captured_prizes[i - 1]["value"], captured_prizes[i - 1]["currency"]
+                else:
+                    prize_value, currency_type = parse_prize_text(card["text"])
+                if currency_type == "Coins":
+                    value_text = f"{prize_value} ({currency_type})"
+                elif currency_type == "Dollars":
+                    value_text = f"${prize_value} ({currency_type})"
+                else:
+                    value_text = "unknown currency"
+                if card["claimed"]:
+                    status = "Already Claimed"
+                elif card["claimable"]:
+                    status = "claiming"
+                    eligible.append(card["index"])
+                    prize_values[card["index"]] = prize_value
+                else:
+                    status = "⚠ No enabled 'Claim Prize' button"
+                print(f"Prize {i}/{len(prize_cards)}: {card['text'] or '?'} - {value_text} - {status}")
+                prize_records[card["index"]] = PrizeRecord(
+                    name=card["text"], value=prize_value, currency=currency_type,
+                    status="already_claimed" if card["claimed"] else "unavailable")
+
+            # Only cards whose button was actually clicked count as claimed
+            clicked = []
+            if eligible:
+                # Click every eligible button in one call, then watch the DOM for the cards to flip
+                clicked = driver.execute_script(CLAIM_PRIZES_JS, eligible, card_scan["selector"])
+                print(f"\n✓ Clicked {len(clicked)} 'Claim Prize' button(s)")
+                if len(clicked) < len(eligible):
+                    print(f"⚠ {len(eligible) - len(clicked)} 'Claim Prize' button(s) were gone before they could be clicked")
+                confirmation = wait_until(driver, claims_confirmed, CLAIM_CONFIRM_TIMEOUT)
+                if confirmation is None:
+                    confirmation = driver.execute_script(CLAIM_CONFIRMATION_JS)
+                    print(f"⚠ {confirmation['pending']} claim(s) not confirmed by the page within {CLAIM_CONFIRM_TIMEOUT}s")
+                else:
+                    print(f"✓ All {confirmation['confirmed']} claim(s) confirmed by the page")
+                for index in clicked:
+                    prize_records[index].status = "claimed"
+                    prize_records[index].confirmed = index not in confirmation["pending_indexes"]
+            for record in prize_records.values():
+                emit(record)
+
+            # Summary
+            print_claim_summary(len(prize_cards), len(clicked), sum(prize_values[index] for index in clicked))
+
+        except Exception as e:
+            print(f"\n⚠ Error while trying to claim individual prizes: {e}")
+            print("This may be because you have no prizes to claim or the page layout changed.")
+
+def run_once(driver, games):
+    """One full pass: join every game's free tournaments, then claim prizes.
+    driver may be a warm browser from a previous pass, or None to start one only if needed.
+    Returns the driver (None if the HTTP fast path handled everything)."""
+    print("\n" + "="*70)
+    print(f"  Checking {len(games)} game(s) for tournaments...")
+    print("="*70 + "\n")
+
+    run_summary.clear()
+    response_captures.clear()
+    run_started = time.perf_counter()
+    watchdog.reset()
+    run_summary.update(started_at=datetime.now().isoformat(timespec="seconds"), games={}, claims=None)
+
+    with tracer.span("run"):
+        # Initialize the counter for free tournaments
+        free_tourneys = 0
+        browser_games = games
+        claims_done = False
+
+        # Try the browser-free HTTP path first; anything it can't do falls back to Selenium
+        if HTTP_FAST_PATH:
+            with tracer.span("http_fast_path"):
+                http_results, browser_games, claims_done = run_http_fast_path(games, automation_profile)
+            free_tourneys += sum(http_results.values())
+            for game_index, joins in http_results.items():
+                run_summary["games"][games[game_index - 1]['name']] = joins
+
+        if browser_games or not claims_done:
+            if driver is None:
+                # Initialize the WebDriver on the main automation profile and debugging port
+                driver = start_browser()
+
+            if browser_games:
+                game_results, driver = run_games(driver, browser_games)
+                free_tourneys += sum(game_results.values())
+                for game_index, joins in game_results.items():
+                    run_summary["games"][browser_games[game_index - 1]['name']] = joins
+
+        print("\nTourneys Joined this Session: " + str(free_tourneys))
+
+        if not claims_done:
+            with tracer.span("claim_prizes"):
+                claim_prizes(driver)
+
+        if driver is not None:
+            # Keep the session cookies around for the HTTP fast path on the next run
+            export_session_cookies(driver, os.path.join(automation_profile, SESSION_COOKIE_EXPORT))
+
+    watchdog.print_report(run_started)
+    run_summary.update(joins=free_tourneys, finished_at=datetime.now().isoformat(timespec="seconds"))
+    if RUN_SUMMARY_FILE:
+        write_run_summary(RUN_SUMMARY_FILE)
+
+    # Persist what the locators learned and flag any that have stopped matching
+    locator_cache.save()
+    locator_cache.report()
+
+    # Per-phase timings for this pass
+    for name, phase in sorted(tracer.breakdown().items(), key=lambda item: item[1]["first_start"]):
+        emit(PhaseTiming(name=name, count=phase["count"], seconds=phase["total"],
+                         webdriver_commands=phase["commands"]))
+    tracer.print_breakdown()
+    if TRACE_FILE:
+        tracer.write(TRACE_FILE)
+        print(f"Trace written to {TRACE_FILE}")
+    tracer.reset()
+    return driver
+
+def build_wake_queue(listings, now):
+    """Build a time-ordered heap of (wake time, reason) from the latest tournament listings.
+    Always contains the next listing refresh, plus the registration opening of every free,
+    public tournament that isn't joinable yet."""
+    wake_queue = [(now + timedelta(minutes=DAEMON_REFRESH_MINUTES), "listing refresh")]
+    for rows in listings.values():
+        for row in rows:
+            if row["join_state"] != "closed" or row["entry_type"] != "free" or row["password"]:
+                continue
+            starts_at = parse_tournament_date(row["start_time"], now)
+            if starts_at is None:
+                continue
+            opens_at = starts_at - timedelta(minutes=REGISTRATION_LEAD_MINUTES)
+            if opens_at > now:
+                heapq.heappush(wake_queue, (opens_at, f"registration opens for {row['name'] or row['href']}"))
+            elif starts_at > now:
+                # Inside the window but not joinable yet: check again soon rather than at the next refresh
+                heapq.heappush(wake_queue, (now + timedelta(minutes=DAEMON_MIN_SLEEP_MINUTES),
+                                            f"waiting on registration for {row['name'] or row['href']}"))
+    return wake_queue
+
+def browser_alive(driver):
+    """Check that a warm browser kept between daemon passes still responds"""
+    try:
+        driver.window_handles
+        return True
+    except Exception:
+        return False
+
+def run_daemon(games, driver=None):
+    """Keep one warm browser/session alive and run a pass whenever a listing refresh is due or a
+    tournament's registration opens, sleeping in between. Runs until interrupted with Ctrl+C.
+    Returns the driver so the caller can close it."""
+    print("\n" + "="*70)
+    print("  Daemon mode: waiting on tournament start times (Ctrl+C to stop)")
+    print("="*70)
+    try:
+        while True:
+            if driver is not None and not browser_alive(driver):
+                print("⚠ Warm browser stopped responding, starting a new one on the next pass")
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+                driver = None
+
+            try:
+                driver = run_once(driver, games)
+            except Exception as e:
+                print(f"⚠ Pass failed: {e}")
+            join_ledger.prune()
+
+            now = datetime.now()
+            wake_queue = build_wake_queue(latest_listings, now)
+            wake_at, reason = wake_queue[0]
+            wake_at = max(wake_at, now + timedelta(minutes=DAEMON_MIN_SLEEP_MINUTES))
+            print(f"\nNext pass at {wake_at:%H:%M:%S} ({reason}, {len(wake_queue) - 1} registration(s) queued)")
+            time.sleep((wake_at - datetime.now()).total_seconds())
+    except KeyboardInterrupt:
+        print("\nDaemon stopped")
+    return driver
+
+# ============================================================================
+# ENGINE - Importable entry points with a stream of typed result records
+# ============================================================================
+
+# Opened by Engine() and used by every phase
+join_ledger = None
+locator_cache = None
+
+@dataclass
+class TournamentRecord:
+    """One tournament row from a game's listing (scan)"""
+    game: str
+    url: str
+    name: str = None
+    entry_type: str = None
+    join_state: str = None
+    password: bool = False
+    start_time: str = None
+    prize: str = None
+    currency: str = None
+    qualifies: bool = False
+
+@dataclass
+class JoinOutcome:
+    """What happened to one tournament: "joined", "rejected" or "not_free" """
+    game: str
+    url: str
+    outcome: str
+    name: str = None
+    reason: str = None
+    prize: str = None
+    currency: str = None
+    dates: list = field(default_factory=list)
+
+@dataclass
+class PrizeRecord:
+    """One prize card: "claimed", "already_claimed" or "unavailable". confirmed is None when
+    the claim wasn't made through the page (or there was nothing to confirm)."""
+    name: str
+    value: float
+    currency: str
+    status: str
+    confirmed: bool = None
+
+@dataclass
+class PhaseTiming:
+    """Wall time and WebDriver commands of one phase of a pass"""
+    name: str
+    count: int
+    seconds: float
+    webdriver_commands: int
+
+# Called with every record as it is produced (from any worker thread)
+result_listeners = []
+
+def emit(record):
+    for listener in list(result_listeners):
+        listener(record)
+
+def record_outcome(game, url, outcome, reason=None, name=None, prize=None, currency=None, dates=None):
+    """Store a join outcome in the ledger and pass it on to the result stream"""
+    join_ledger.record(url, outcome, reason=reason, name=name, prize=prize, currency=currency, dates=dates)
+    emit(JoinOutcome(game=game['name'] if isinstance(game, dict) else game, url=url, outcome=outcome,
+                     name=name, reason=reason, prize=prize, currency=currency, dates=list(dates or [])))
+
+def configure(**settings):
+    """Override module settings by name, e.g. configure(LEAN_MODE=True, TAB_WINDOW=6). Settings of
+    repeat_gg_api (SITE_URL, API_BASE_URL, REQUEST_TIMEOUT...) are set there too. Everything is
+    read when it is used, so an override applies everywhere; the games list resolves SITE_URL when
+    an Engine loads it."""
+    modules = [globals(), vars(repeat_gg_api)]
+    for name, value in settings.items():
+        owners = [namespace for namespace in modules if name.isupper() and name in namespace]
+        if not owners:
+            raise ValueError(f"Unknown setting: {name}")
+        for namespace in owners:
+            namespace[name] = value
+    if "SITE_URL" in settings:
+        repeat_gg_api.SITE_URL = globals()["SITE_URL"] = settings["SITE_URL"].rstrip("/")
+
+class Engine:
+    """Runs scans, joins and prize claims against one lazily started browser, and yields
+    typed records as it goes. The module keeps one set of state (ledger, caches, browser),
+    so use one Engine per process."""
+
+    def __init__(self, games=None, **settings):
+        global join_ledger, locator_cache
+        configure(**settings)
+
+        # Debug: Print paths to verify they're loaded
+        print(f"Profile Path: {PROFILE_PATH}")
+        print(f"Profile Name: {PROFILE_NAME}")
+        print(f"ChromeDriver Path: {CHROMEDRIVER_PATH}")
+        if HEADLESS_MODE:
+            print("Running in HEADLESS mode (invisible browser)...")
+        else:
+            print("Running in VISIBLE mode (browser will be shown)...")
+        if LEAN_MODE:
+            print("Lean mode on: images, fonts, video and trackers are blocked")
+
+        self.games = self.resolve_games(games) if games else load_games()
+
+        # Open the join ledger and forget tournaments that have already ended
+        join_ledger = JoinLedger(os.path.join(os.getcwd(), LEDGER_FILE))
+        expired_entries = join_ledger.prune()
+        if expired_entries:
+            print(f"Removed {expired_entries} expired join ledger entr{'y' if expired_entries == 1 else 'ies'}")
+
+        # Selector variants that worked on earlier runs are tried first
+        locator_cache = LocatorCache(os.path.join(os.getcwd(), LOCATOR_CACHE_FILE))
+        self.driver = None
+        self.worker = None
+
+    def __enter__(self):
+        return self
+
+    def resolve_games(self, games):
+        """Games given as {"name", "path" or "url", optional "filters"} dicts, or the engine's own"""
+        return games_from_config({"games": games}, []) if games else self.games
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def browser(self):
+        """The engine's browser, started on first use"""
+        if self.driver is None or not browser_alive(self.driver):
+            self.driver = start_browser()
+        return self.driver
+
+    def stream(self, work):
+        """Run work() in a worker thread and yield the records it emits as they arrive.
+        Leaving the loop early waits for work() to finish; its remaining records are dropped."""
+        if self.worker is not None and self.worker.is_alive():
+            raise RuntimeError("Another scan, join, claim or run is still in progress on this engine")
+        records = queue.Queue()
+        finished = object()
+        failure = []
+
+        def worker():
+            try:
+                work()
+            except BaseException as e:
+                failure.append(e)
+            finally:
+                records.put(finished)
+
+        # Spans and resource samples only need to cover the current stream
+        tracer.reset()
+        result_listeners.append(records.put)
+        try:
+            self.worker = threading.Thread(target=worker, name="engine", daemon=True)
+            self.worker.start()
+            while True:
+                record = records.get()
+                if record is finished:
+                    break
+                yield record
+        finally:
+            result_listeners.remove(records.put)
+            self.worker.join()
+        if failure:
+            raise failure[0]
+
+    def scan(self, games=None):
+        """Read every game's listing without joining anything. Yields TournamentRecord."""
+        def work():
+            for game in self.resolve_games(games):
+                rows = load_listing(self.browser, game)[0] or []
+                qualifying = {row["href"] for row in apply_game_filter(game, [row for row in rows if row_qualifies(row)])}
+                for row in rows:
+                    emit(TournamentRecord(game=game['name'], url=row["href"], name=row.get("name"),
+                                          entry_type=row.get("entry_type"), join_state=row.get("join_state"),
+                                          password=bool(row.get("password")), start_time=row.get("start_time"),
+                                          prize=row.get("prize"), currency=row.get("currency"),
+                                          qualifies=row["href"] in qualifying))
+        return self.stream(work)
+
+    def join(self, games=None):
+        """Join every qualifying tournament of the games. Yields JoinOutcome."""
+        def work():
+            _, self.driver = run_games(self.browser, self.resolve_games(games))
+        return self.stream(work)
+
+    def claim(self):
+        """Claim every available prize. Yields PrizeRecord."""
+        return self.stream(lambda: claim_prizes(self.browser))
+
+    def run(self):
+        """One full pass like the command line's (HTTP fast path, joins, claims, summaries).
+        Yields every record, ending with the pass's PhaseTiming records."""
+        def work():
+            self.driver = run_once(self.driver, self.games)
+        return self.stream(work)
+
+    def run_daemon(self):
+        """Run passes until interrupted (see run_daemon). Records are not collected."""
+        self.driver = run_daemon(self.games, self.driver)
+
+    def close(self):
+        """Save the locator cache, close the ledger and the browser (an attached Chrome is left running)"""
+        if self.worker is not None:
+            self.worker.join()
+        if locator_cache is not None:
+            locator_cache.save()
+        if join_ledger is not None:
+            join_ledger.close()
+        if self.driver is None:
+            pass  # The HTTP fast path handled everything, no browser was started
+        elif ATTACH_MODE:
+            print(f"Leaving Chrome running on port {BASE_DEBUG_PORT} for the next run")
+            detach_driver(self.driver)
+        else:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+        self.driver = None
@@ -0,0 +1,118 @@
+"""Run repeat-gg-automated.py for several repeat.gg accounts at once.
+
+Each account runs the script in its own Python process, with its own automation profile,
+join ledger and debugging port under accounts/<name>/. Game listings are the same for every
+account, so only one account loads each game page and the others reuse its rows (through
+accounts/shared_listings). When every account has finished, a combined summary is printed.
+
+The accounts file is a JSON list with one entry per Chrome profile that is logged in to an
+account:
+
+    [
+        {"name": "main", "profile_path": "C:\\\\Users\\\\you\\\\AppData\\\\Local\\\\Google\\\\Chrome\\\\User Data",
+         "profile_name": "Profile 6"},
+        {"name": "alt", "profile_path": "C:\\\\Users\\\\you\\\\AppData\\\\Local\\\\Google\\\\Chrome\\\\User Data",
+         "profile_name": "Profile 7"}
+    ]
+
+Usage:
+    python run_accounts.py accounts.json
+    python run_accounts.py accounts.json --workers 2 --base-port 9300
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "repeat-gg-automated.py")
+PORTS_PER_ACCOUNT = 10  # Room for the account's own PARALLEL_WORKERS (BASE_DEBUG_PORT + N)
+
+
+def account_dir_name(name):
+    return re.sub(r"[^\w.-]", "_", name)
+
+
+def run_account(account, index, args):
+    """Run the script for one account and return its summary"""
+    account_dir = os.path.abspath(os.path.join(args.work_dir, account_dir_name(account["name"])))
+    os.makedirs(account_dir, exist_ok=True)
+    summary_file = os.path.join(account_dir, "run_summary.json")
+    if os.path.exists(summary_file):
+        os.remove(summary_file)
+    env = dict(os.environ,
+               PROFILE_PATH=account["profile_path"],
+               PROFILE_NAME=account["profile_name"],
+               AUTOMATION_PROFILE_DIR=os.path.join(account_dir, "chrome_automation_profile"),
+               JOIN_LEDGER_FILE=os.path.join(account_dir, "join_ledger.sqlite3"),
+               DEBUG_PORT=str(args.base_port + index * PORTS_PER_ACCOUNT),
+               RUN_SUMMARY_FILE=summary_file,
+               SHARED_LISTINGS_DIR=os.path.abspath(os.path.join(args.work_dir, "shared_listings")))
+
+    start = time.perf_counter()
+    with open(os.path.join(account_dir, "output.txt"), "w", encoding="utf-8") as output:
+        result = subprocess.run([sys.executable, SCRIPT] + args.script_args, cwd=account_dir, env=env,
+                                stdout=output, stderr=subprocess.STDOUT)
+    try:
+        with open(summary_file, "r", encoding="utf-8") as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        summary = {}
+    summary.update(account=account["name"], exit_code=result.returncode,
+                   wall_seconds=time.perf_counter() - start, output=os.path.join(account_dir, "output.txt"))
+    return summary
+
+
+def print_report(summaries):
+    print("\n" + "="*70)
+    print("  ACCOUNTS SUMMARY")
+    print("="*70)
+    print(f"{'Account':<20}{'Joined':>8}{'Claimed':>9}{'Value':>10}{'Seconds':>9}  Status")
+    for summary in summaries:
+        claims = summary.get("claims") or {}
+        status = "ok" if summary["exit_code"] == 0 else f"exit {summary['exit_code']}, see {summary['output']}"
+        print(f"{summary['account'][:19]:<20}{summary.get('joins', 0):>8}{claims.get('claimed', 0):>9}"
+              f"{'$' + format(claims.get('value', 0), '.2f'):>10}{summary['wall_seconds']:>9.1f}  {status}")
+        for game, joins in summary.get("games", {}).items():
+            print(f"    {game}: {joins} tournament(s) joined")
+    print("="*70)
+    print(f"Total: {sum(s.get('joins', 0) for s in summaries)} tournament(s) joined, "
+          f"{sum((s.get('claims') or {}).get('claimed', 0) for s in summaries)} prize(s) claimed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run repeat-gg-automated.py for several accounts concurrently")
+    parser.add_argument("accounts", nargs="?", default="accounts.json", help="JSON list of accounts")
+    parser.add_argument("--workers", type=int, default=0, help="Accounts to run at once (default: all)")
+    parser.add_argument("--base-port", type=int, default=9300,
+                        help=f"Debugging port of the first account; each next one gets {PORTS_PER_ACCOUNT} more")
+    parser.add_argument("--work-dir", default="accounts", help="Where each account's profile and ledger live")
+    parser.add_argument("script_args", nargs=argparse.REMAINDER, help="Passed on to repeat-gg-automated.py")
+    args = parser.parse_args()
+
+    with open(args.accounts, "r", encoding="utf-8") as f:
+        accounts = json.load(f)
+    if not accounts:
+        print("No accounts to run")
+        return
+
+    workers = args.workers or len(accounts)
+    print(f"Running {len(accounts)} account(s), {min(workers, len(accounts))} at a time...")
+    summaries = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_account, account, index, args): account
+                   for index, account in enumerate(accounts)}
+        for future in as_completed(futures):
+            summary = future.result()
+            print(f"✓ {summary['account']} finished in {summary['wall_seconds']:.1f}s")
+            summaries.append(summary)
+
+    order = [account["name"] for account in accounts]
+    print_report(sorted(summaries, key=lambda summary: order.index(summary["account"])))
+
+
+if __name__ == "__main__":
+    main()
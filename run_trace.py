@@ -0,0 +1,257 @@
+"""Per-phase timing traces for repeat_gg_engine.py.
+
+Spans nest per thread and record wall time, the WebDriver commands issued while they were
+open (count and response bytes) and the peak RSS of the Chrome process tree. The background
+sampler behind the RSS figures also records CPU, which the resource watchdog reads. Traces can be
+written as JSON lines or in Chrome trace-event format (open in chrome://tracing or Perfetto),
+and a per-phase breakdown is printed at the end of each run.
+
+psutil is optional; without it the RSS columns are left empty.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+RSS_SAMPLE_INTERVAL = 0.5  # Seconds between Chrome memory/CPU samples while a trace is running
+
+
+class Tracer:
+    """Collects nested spans from every thread of a run"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.spans = []
+        self.browser_pids = []
+        self.samples = []  # (perf_counter time, total RSS bytes, total CPU %, process count)
+        self.sampler = None
+        self.origin = time.perf_counter()
+
+    # ------------------------------------------------------------------
+    # WebDriver accounting
+    # ------------------------------------------------------------------
+
+    def counters(self):
+        """Running (commands, bytes) totals for the calling thread"""
+        if not hasattr(self.local, "commands"):
+            self.local.commands = 0
+            self.local.bytes = 0
+        return self.local
+
+    def instrument(self, driver):
+        """Count every command this driver sends, and track its Chrome process tree's memory"""
+        executor = driver.command_executor
+        original_execute = executor.execute
+        tracer = self
+
+        def counting_execute(command, params):
+            response = original_execute(command, params)
+            counters = tracer.counters()
+            counters.commands += 1
+            try:
+                counters.bytes += len(json.dumps(response.get("value"), default=str))
+            except Exception:
+                pass
+            return response
+
+        executor.execute = counting_execute
+        try:
+            self.browser_pids.append(driver.service.process.pid)
+        except Exception:
+            pass  # Attached sessions have no chromedriver process of our own
+        self.start_sampler()
+
+    # ------------------------------------------------------------------
+    # Chrome memory
+    # ------------------------------------------------------------------
+
+    def process_tree(self, pid):
+        """pid and every process under it, or [] once it has exited"""
+        try:
+            root = psutil.Process(pid)
+            return [root] + root.children(recursive=True)
+        except psutil.Error:
+            return []
+
+    def chrome_processes(self):
+        """Every live process of the tracked browsers: chromedriver, Chrome and everything under them.
+        Browsers that have exited (recycled or closed) stop being tracked."""
+        processes = {}
+        for pid in list(self.browser_pids):
+            tree = self.process_tree(pid)
+            if not tree:
+                try:
+                    self.browser_pids.remove(pid)
+                except ValueError:
+                    pass
+            for process in tree:
+                processes[process.pid] = process
+        return list(processes.values())
+
+    def chrome_rss(self):
+        """Total resident memory of chromedriver and every Chrome process under it, in bytes"""
+        if psutil is None:
+            return None
+        total = 0
+        for process in self.chrome_processes():
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    def start_sampler(self):
+        if psutil is None or self.sampler is not None:
+            return
+
+        def sample():
+            cpu_processes = {}  # pid -> psutil.Process, kept so cpu_percent() measures between samples
+            while True:
+                rss = cpu = 0
+                alive = {}
+                for process in self.chrome_processes():
+                    process = cpu_processes.get(process.pid, process)
+                    try:
+                        rss += process.memory_info().rss
+                        cpu += process.cpu_percent(None)  # 0 on the first call for a process
+                        alive[process.pid] = process
+                    except psutil.Error:
+                        pass
+                cpu_processes = alive
+                with self.lock:
+                    self.samples.append((time.perf_counter(), rss, cpu, len(alive)))
+                time.sleep(RSS_SAMPLE_INTERVAL)
+
+        self.sampler = threading.Thread(target=sample, name="chrome-rss-sampler", daemon=True)
+        self.sampler.start()
+
+    def peak_rss(self, start, end):
+        if psutil is None:
+            return None
+        with self.lock:
+            samples = [sample[1] for sample in self.samples if start <= sample[0] <= end]
+        samples.append(self.chrome_rss())
+        return max(samples)
+
+    def samples_since(self, since):
+        """(perf_counter time, RSS bytes, CPU %, process count) samples taken since then"""
+        with self.lock:
+            return [sample for sample in self.samples if sample[0] >= since]
+
+    # ------------------------------------------------------------------
+    # Spans
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """Time a phase. Yields a dict that the caller can add attributes to."""
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        counters = self.counters()
+        record = {
+            "name": name,
+            "parent": stack[-1]["name"] if stack else None,
+            "depth": len(stack),
+            "thread": threading.current_thread().name,
+            "attrs": attrs,
+        }
+        stack.append(record)
+        start = time.perf_counter()
+        start_commands, start_bytes = counters.commands, counters.bytes
+        try:
+            yield attrs
+        finally:
+            end = time.perf_counter()
+            stack.pop()
+            record.update({
+                "start": start - self.origin,
+                "duration": end - start,
+                "webdriver_commands": counters.commands - start_commands,
+                "webdriver_bytes": counters.bytes - start_bytes,
+                "peak_rss": self.peak_rss(start, end),
+            })
+            with self.lock:
+                self.spans.append(record)
+
+    def reset(self):
+        """Forget the recorded spans (the instrumented drivers stay instrumented)"""
+        with self.lock:
+            self.spans = []
+            self.samples = []
+        self.origin = time.perf_counter()
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+
+    def write(self, path):
+        """Write the spans to path: Chrome trace-event format for .json, JSON lines otherwise.
+        JSON lines are appended, so a daemon's passes accumulate in one file."""
+        with self.lock:
+            spans = sorted(self.spans, key=lambda span: span["start"])
+        if path.endswith(".json"):
+            threads = {}
+            events = []
+            for span in spans:
+                tid = threads.setdefault(span["thread"], len(threads) + 1)
+                events.append({
+                    "name": span["name"], "ph": "X", "pid": os.getpid(), "tid": tid,
+                    "ts": round(span["start"] * 1e6), "dur": round(span["duration"] * 1e6),
+                    "args": dict(span["attrs"], webdriver_commands=span["webdriver_commands"],
+                                 webdriver_bytes=span["webdriver_bytes"], peak_rss=span["peak_rss"]),
+                })
+            events += [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+                        "args": {"name": thread}} for thread, tid in threads.items()]
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        else:
+            with open(path, "a", encoding="utf-8") as f:
+                for span in spans:
+                    f.write(json.dumps(span, default=str) + "\n")
+
+    def breakdown(self):
+        """Aggregate spans by phase name: count, total/max wall time, commands, bytes, peak RSS"""
+        phases = {}
+        with self.lock:
+            spans = list(self.spans)
+        for span in spans:
+            phase = phases.setdefault(span["name"], {
+                "depth": span["depth"], "first_start": span["start"], "count": 0, "total": 0.0,
+                "max": 0.0, "commands": 0, "bytes": 0, "peak_rss": None})
+            if span["start"] < phase["first_start"]:
+                phase["depth"], phase["first_start"] = span["depth"], span["start"]
+            phase["count"] += 1
+            phase["total"] += span["duration"]
+            phase["max"] = max(phase["max"], span["duration"])
+            phase["commands"] += span["webdriver_commands"]
+            phase["bytes"] += span["webdriver_bytes"]
+            if span["peak_rss"] is not None:
+                phase["peak_rss"] = max(phase["peak_rss"] or 0, span["peak_rss"])
+        return phases
+
+    def print_breakdown(self):
+        phases = self.breakdown()
+        if not phases:
+            return
+        print("\n" + "="*70)
+        print("  TIMING BREAKDOWN")
+        print("="*70)
+        print(f"{'Phase':<28}{'Count':>6}{'Total s':>9}{'Max s':>8}{'Cmds':>7}{'WD KB':>8}{'RSS MB':>8}")
+        for name, phase in sorted(phases.items(), key=lambda item: item[1]["first_start"]):
+            label = ("  " * phase["depth"] + name)[:27]
+            rss = f"{phase['peak_rss'] / 2**20:.0f}" if phase["peak_rss"] is not None else "-"
+            print(f"{label:<28}{phase['count']:>6}{phase['total']:>9.2f}{phase['max']:>8.2f}"
+                  f"{phase['commands']:>7}{phase['bytes'] / 1024:>8.0f}{rss:>8}")
+        print("="*70)
+
+
+# Shared by the whole script
+tracer = Tracer()
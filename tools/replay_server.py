@@ -0,0 +1,99 @@
+"""Local stand-in for the repeat.gg backend that replays recorded API responses.
+
+Usage:
+    python tools/replay_server.py tools/recordings/example.json --port 8765
+
+Then run the script with REPEAT_GG_API_URL=http://127.0.0.1:8765 and HTTP_FAST_PATH = True.
+
+A recording is a JSON file with a list of interactions:
+    {"interactions": [{"method": "GET", "path": "/tournaments",
+                       "query": {"game": "rocket-league"}, "status": 200, "body": {...}}]}
+"query" is optional and only has to be a subset of the request's query string. When several
+interactions match the same request they are replayed in order, and the last one repeats.
+"""
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real backend
+
+    def handle_any(self):
+        url = urlsplit(self.path)
+        query = dict(parse_qsl(url.query))
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        interaction = self.server.next_interaction(self.command, url.path, query)
+        if interaction is None:
+            status, body = 404, {"error": f"No recorded response for {self.command} {self.path}"}
+        else:
+            status, body = interaction.get("status", 200), interaction.get("body", {})
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_DELETE = handle_any
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, interactions, quiet=False):
+        super().__init__(address, ReplayHandler)
+        self.interactions = interactions
+        self.quiet = quiet
+        self.replayed = {}
+        self.lock = threading.Lock()
+
+    def next_interaction(self, method, path, query):
+        """Return the next recorded interaction for this request, or None if nothing matches"""
+        matches = [i for i, interaction in enumerate(self.interactions)
+                   if interaction.get("method", "GET").upper() == method
+                   and interaction["path"] == path
+                   and all(query.get(k) == str(v) for k, v in interaction.get("query", {}).items())]
+        if not matches:
+            return None
+        key = (method, path, tuple(sorted(query.items())))
+        with self.lock:
+            count = self.replayed.get(key, 0)
+            self.replayed[key] = count + 1
+        return self.interactions[matches[min(count, len(matches) - 1)]]
+
+
+def load_recording(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["interactions"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded repeat.gg API responses")
+    parser.add_argument("recording", help="JSON file with the recorded interactions")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--quiet", action="store_true", help="Don't log every request")
+    args = parser.parse_args()
+
+    server = ReplayServer((args.host, args.port), load_recording(args.recording), args.quiet)
+    print(f"Replaying {args.recording} on http://{args.host}:{args.port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()